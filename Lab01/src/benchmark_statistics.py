@@ -0,0 +1,66 @@
+import argparse
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import statistics_calculator
+
+NUMERIC_COLUMNS = ['Estrelas', 'Releases', 'Pull Requests Aceitos', 'Total de Issues Abertas', 'Total de Issues Fechadas']
+DATE_COLUMNS = ['Data de Criação', 'Última Atualização']
+
+
+def generate_data(rows, seed=42):
+    """Gera um conjunto sintético com as mesmas colunas da coleta, com datas em texto ISO como vêm da API."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2008-01-01", tz="UTC").value // 10**9
+    end = pd.Timestamp("2024-12-31", tz="UTC").value // 10**9
+
+    data = {column: rng.zipf(1.8, rows).clip(max=500_000) for column in NUMERIC_COLUMNS}
+    created = rng.integers(start, end, rows)
+    updated = created + rng.integers(0, end - created + 1)
+    data['Data de Criação'] = pd.to_datetime(created, unit="s", utc=True).strftime("%Y-%m-%dT%H:%M:%SZ")
+    data['Última Atualização'] = pd.to_datetime(updated, unit="s", utc=True).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return pd.DataFrame(data)
+
+
+def legacy_middle_age(data):
+    """Implementação anterior: um pd.to_datetime e um datetime.now() por linha."""
+    repos_age = []
+    for value in data.values:
+        creation_date = pd.to_datetime(value[0])
+        age = datetime.now(timezone.utc) - creation_date
+        repos_age.append(age.days)
+    return round(float(pd.Series(repos_age).mean() / 365.25), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o cálculo vetorizado de estatísticas com milhões de linhas.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000, 5_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=100_000,
+                        help='Maior tamanho em que a implementação anterior ainda é medida')
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        data = generate_data(rows)
+        reference_time = pd.Timestamp.now(tz="UTC")
+
+        started = time.perf_counter()
+        statistics = statistics_calculator.calculate_statistics(data, NUMERIC_COLUMNS, DATE_COLUMNS, reference_time)
+        seconds = time.perf_counter() - started
+        middle_age = statistics_calculator.statistic_value(statistics, 'Data de Criação', 'idade média (anos)')
+        line = f"{rows:>10,} linhas: vetorizado {seconds:.2f}s ({rows / seconds:,.0f} linhas/s)"
+
+        if rows <= args.legacy_max_rows:
+            started = time.perf_counter()
+            legacy = legacy_middle_age(data[['Data de Criação']])
+            legacy_seconds = time.perf_counter() - started
+            status = "✅" if legacy == middle_age else "❌"
+            line += f" | anterior (só idade média) {legacy_seconds:.2f}s {status}"
+
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
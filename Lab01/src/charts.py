@@ -0,0 +1,63 @@
+"""Funções de desenho dos gráficos do Lab01. Cada uma recebe a figura e só os dados de que precisa."""
+
+
+def drawTopRepositories(fig, df_top10):
+    # Gráfico de barras: Estrelas por repositório (Top 10)
+    ax = fig.add_subplot()
+    ax.barh(df_top10["Nome"], df_top10["Estrelas"], color="skyblue")
+    ax.set_xlabel("Número de Estrelas")
+    ax.set_ylabel("Repositório")
+    ax.set_title("Top 10 Repositórios por Número de Estrelas")
+    ax.invert_yaxis()
+
+
+def drawLanguagePie(fig, languageCounts):
+    # Gráfico de pizza: Linguagens mais usadas (Top 10 repositórios)
+    ax = fig.add_subplot()
+    languageCounts.plot(kind="pie", autopct="%1.1f%%", startangle=140, cmap="Set3", ax=ax)
+    ax.set_title("Distribuição das Linguagens de Programação (Top 10 Repositórios)")
+    ax.set_ylabel("")
+
+
+def drawPullRequestsVsIssues(fig, df_top10):
+    # Gráfico de dispersão: PRs x Issues (Top 10 repositórios)
+    ax = fig.add_subplot()
+    ax.scatter(df_top10["Pull Requests Aceitos"], df_top10["Total de Issues Abertas"], color="orange", alpha=0.7)
+    ax.set_xlabel("Pull Requests Aceitos")
+    ax.set_ylabel("Total de Issues")
+    ax.set_title("Pull Requests Aceitos vs Total de Issues (Top 10 Repositórios)")
+
+
+def drawTopLanguages(fig, top_languages):
+    ax = fig.add_subplot()
+    top_languages.sort_values().plot(kind='barh', color='royalblue', ax=ax)
+    ax.set_xlabel("Número de Repositórios")
+    ax.set_ylabel("Linguagem")
+    ax.set_title("Top 10 Linguagens Mais Utilizadas")
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+
+
+def drawLanguageMetrics(fig, df_metrics):
+    # Gráfico de barras agrupadas por linguagem
+    ax = fig.add_subplot()
+    df_metrics.plot(kind='bar', colormap='viridis', ax=ax)
+    ax.set_title("Métricas por Linguagem Popular")
+    ax.set_ylabel("Quantidade")
+    ax.set_xlabel("Linguagem")
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.legend(["PR Aceitos", "Releases", "Dias Desde Última Atualização"])
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+
+def drawTopLanguagesDetailed(fig, top_languages):
+    ax = fig.add_subplot()
+    top_languages.sort_values().plot(kind='barh', color='royalblue', edgecolor='black', ax=ax)
+
+    # Adicionando rótulos e título
+    ax.set_xlabel("Número de Repositórios")
+    ax.set_ylabel("Linguagem")
+    ax.set_title("Top 10 Linguagens Mais Utilizadas nos Repositórios do GitHub")
+
+    # Melhorando a legibilidade
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    ax.invert_yaxis()
@@ -1,7 +1,54 @@
+import os
+from datetime import date
+
 import pandas as pd
 
+DATE_COLUMNS = ["Data de Criação", "Última Atualização"]
+CATEGORY_COLUMNS = ["Linguagem Principal", "Proprietário"]
+PARTITION_KEY = "collection_date"
+
 
 def csv_writer(data, filename):
     dataframe = pd.DataFrame(data)
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
         csvfile.write(dataframe.to_string(index=False))
+
+
+def parquet_writer(data, base_dir, collection_date=None):
+    """
+    Grava os repositórios em Parquet (zstd) numa partição por data de coleta:
+    <base_dir>/collection_date=AAAA-MM-DD/repos.parquet. Datas viram datetime UTC e
+    linguagem/proprietário viram colunas categóricas (dictionary encoding no Parquet).
+    Os `attrs` do DataFrame (como o instante de referência das idades) vão nos metadados do arquivo.
+    """
+    dataframe = pd.DataFrame(data)
+    dataframe.attrs.update(getattr(data, "attrs", {}))
+    for column in DATE_COLUMNS:
+        if column in dataframe:
+            dataframe[column] = pd.to_datetime(dataframe[column], utc=True)
+    for column in CATEGORY_COLUMNS:
+        if column in dataframe:
+            dataframe[column] = dataframe[column].astype("category")
+
+    collection_date = collection_date or date.today().isoformat()
+    partition_dir = os.path.join(base_dir, f"{PARTITION_KEY}={collection_date}")
+    os.makedirs(partition_dir, exist_ok=True)
+
+    path = os.path.join(partition_dir, "repos.parquet")
+    dataframe.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+    return path
+
+
+def parquet_loader(base_dir, collection_date=None):
+    """Carrega uma coleta gravada por `parquet_writer` (a mais recente, se a data não for informada) via memory map."""
+    import pyarrow.parquet as pq
+
+    partitions = sorted(
+        name.split("=", 1)[1] for name in os.listdir(base_dir) if name.startswith(f"{PARTITION_KEY}=")
+    ) if os.path.isdir(base_dir) else []
+    if not partitions:
+        raise FileNotFoundError(f"Nenhuma coleta encontrada em {base_dir}!")
+
+    collection_date = collection_date or partitions[-1]
+    path = os.path.join(base_dir, f"{PARTITION_KEY}={collection_date}", "repos.parquet")
+    return pq.read_table(path, memory_map=True).to_pandas()
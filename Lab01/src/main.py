@@ -1,45 +1,73 @@
+import argparse
+import os
+import sys
+
 import pandas as pd
 
 import file_adapter
-import repositories_adapter
 import statistics_calculator
 
-# Run
-repositories = repositories_adapter.fetchRepositories()
-if repositories:
-    df = repositories_adapter.processData(repositories)
-    STATISTICS_CALCULATOR_VALUES = df[['Estrelas', 'Releases', 'Pull Requests Aceitos', 'Total de Issues Abertas', 'Total de Issues Fechadas']]
-    REPOS_LAST_UPDATE_VALUES = df[['Última Atualização']]
-    REPOSITORIES_CREATION_DATE = df[['Data de Criação']]
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+import chart_renderer
+
+DATASET_DIR = 'repos_dataset'
 
-    if df is not None:
-        pd.set_option('display.max_rows', None)
-        pd.set_option('display.max_columns', None)
-        file_adapter.csv_writer(df.to_dict('records'), 'repos.csv')
-        media = statistics_calculator.calculate_mean(STATISTICS_CALCULATOR_VALUES)
-        mediana = statistics_calculator.calculate_median(STATISTICS_CALCULATOR_VALUES)
-        moda = statistics_calculator.calculate_mode(STATISTICS_CALCULATOR_VALUES)
-        repositories_middle_age = statistics_calculator.calculate_repositories_middle_age(REPOSITORIES_CREATION_DATE)
-        repositories_median_age = statistics_calculator.calculate_repositories_median_age(REPOSITORIES_CREATION_DATE)
-        repos_last_update_statistics = statistics_calculator.calculate_last_update_statistics(REPOS_LAST_UPDATE_VALUES)
-        
-        print(df.to_string())
-        print("\n==================== MÉDIA ====================\n")
-        print(media)
-        print("\n==================== Mediana ====================\n")
-        print(mediana)
-        print("\n==================== IDADE MÉDIA REPOS ====================\n")
-        print(f"{repositories_middle_age} anos")
-        print(f"{repositories_median_age} anos")
-        print
-        print("\n==================== ÚLTIMA ATUALIZAÇÃO ====================\n")
-        print(repos_last_update_statistics)
-        repositories_adapter.plotGraphs(df)
-        repositories_adapter.printLanguageStats(df)
-        repositories_adapter.plot_top_languages(df)
 
+def main():
+    # Importado aqui: os processos dos gráficos (spawn) reimportam este módulo e não devem criar o cliente da API
+    import repositories_adapter
 
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--from-dataset', action='store_true', help='Usar a última coleta salva em Parquet em vez de consultar a API')
+    parser.add_argument('--charts-dir', help='Gravar os gráficos nesta pasta (sem janelas) em vez de exibi-los')
+    parser.add_argument('--charts-format', choices=['png', 'svg'], default='png', help='Formato dos gráficos gravados')
+    parser.add_argument('--chart-workers', type=int, help='Processos usados para gerar os gráficos')
+    args = parser.parse_args()
+    chart_renderer.configure(args.charts_dir, args.charts_format, args.chart_workers)
 
+    # Run
+    df = None
+    if args.from_dataset:
+        df = file_adapter.parquet_loader(DATASET_DIR)
+    else:
+        repositories = repositories_adapter.fetchRepositories()
+        if repositories:
+            df = repositories_adapter.processData(repositories)
+            file_adapter.parquet_writer(df, DATASET_DIR)
+
+    if df is not None:
+        NUMERIC_COLUMNS = ['Estrelas', 'Releases', 'Pull Requests Aceitos', 'Total de Issues Abertas', 'Total de Issues Fechadas']
+        DATE_COLUMNS = ['Data de Criação', 'Última Atualização']
+
+        if df is not None:
+            pd.set_option('display.max_rows', None)
+            pd.set_option('display.max_columns', None)
+            file_adapter.csv_writer(df.to_dict('records'), 'repos.csv')
+            estatisticas = statistics_calculator.calculate_statistics(df, NUMERIC_COLUMNS, DATE_COLUMNS, df.attrs.get('reference_time'))
+            media = statistics_calculator.statistic_row(estatisticas, 'média', NUMERIC_COLUMNS)
+            mediana = statistics_calculator.statistic_row(estatisticas, 'mediana', NUMERIC_COLUMNS)
+            repositories_middle_age = statistics_calculator.statistic_value(estatisticas, 'Data de Criação', 'idade média (anos)')
+            repositories_median_age = statistics_calculator.statistic_value(estatisticas, 'Data de Criação', 'idade mediana (anos)')
+            repos_last_update_statistics = estatisticas[estatisticas['Coluna'] == 'Última Atualização']
+        
+            print(df.to_string())
+            print("\n==================== MÉDIA ====================\n")
+            print(media)
+            print("\n==================== Mediana ====================\n")
+            print(mediana)
+            print("\n==================== IDADE MÉDIA REPOS ====================\n")
+            print(f"{repositories_middle_age} anos")
+            print(f"{repositories_median_age} anos")
+            print(estatisticas[estatisticas['Coluna'] == 'Data de Criação'].to_string(index=False))
+            print("\n==================== ÚLTIMA ATUALIZAÇÃO ====================\n")
+            print(repos_last_update_statistics.to_string(index=False))
+            languageCube = repositories_adapter.buildLanguageCube(df)
+            repositories_adapter.plotGraphs(df, languageCube)
+            repositories_adapter.printLanguageStats(df, languageCube)
+            repositories_adapter.plot_top_languages(df, languageCube)
 
+    chart_renderer.close()
 
 
+if __name__ == "__main__":
+    main()
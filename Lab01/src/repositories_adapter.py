@@ -1,39 +1,158 @@
 import json
+import math
 import os
+import sys
 import time
-import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
-import requests
 from dotenv import load_dotenv
 
-load_dotenv()
-token = os.getenv("GITHUB_TOKEN")
-
-if not token:
-    raise ValueError("Erro: O token do GitHub não foi encontrado. Verifique o arquivo .env.")
+import charts
 
-headers = {
-    "Authorization": f"Bearer {token}",
-    "Content-Type": "application/json"
-}
-
-GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+import chart_renderer
+import github_client
 
+load_dotenv()
 
-def fetchRepositories():
-    """Faz a requisição GraphQL com paginação para obter 100 repositórios em 4 chamadas de 25."""
-    allRepos = []
+_client = None
+
+
+def getClient():
+    """
+    Cria o cliente da API na primeira consulta. Importar este módulo não exige token, então a análise de
+    uma coleta salva (--from-dataset) funciona sem acesso à API.
+    """
+    global _client
+    if _client is None:
+        token = os.getenv("GITHUB_TOKEN")
+        if not token:
+            raise ValueError("Erro: O token do GitHub não foi encontrado. Verifique o arquivo .env.")
+        _client = github_client.GitHubClient(token)
+    return _client
+
+DATE_COLUMNS = ["Data de Criação", "Última Atualização"]
+
+
+MIN_STARS = 10001  # A coleta considera apenas repositórios com mais de 10000 estrelas
+MAX_WORKERS = 8  # Número de faixas de estrelas buscadas em paralelo
+PAGE_SIZE = 25  # Repositórios por página da busca
+
+# Divisão da busca em faixas: limiares de estrelas contados com `repositoryCount` até separar o top-N em partes iguais
+PROBE_GROWTH = 1.1  # Razão entre os limiares da primeira rodada de contagens
+PROBE_MAX_STARS = 1_000_000  # Último limiar da primeira rodada, acima do qual não se espera nenhum repositório
+PROBES_PER_BOUNDARY = 8  # Limiares testados entre os dois mais próximos de cada limite nas rodadas seguintes
+MAX_PROBE_ROUNDS = 6
+PROBES_PER_QUERY = 50  # Contagens (aliases de search) enviadas numa mesma consulta
+
+
+def postQuery(query, label):
+    """Envia a consulta com até 3 tentativas e retorna o JSON da resposta, ou None se todas falharem."""
+    for attempt in range(3):
+        response = getClient().post(query)
+
+        if response.status_code == 200:
+            return response.json()
+
+        print(f"⚠️ [{label}] Erro {response.status_code}: {response.text}. Tentativa {attempt + 1}/3...")
+        time.sleep(5)
+    return None
+
+
+def countRepositories(thresholds):
+    """
+    Conta os repositórios com pelo menos `t` estrelas para cada limiar `t`, com várias contagens por consulta
+    e as consultas em paralelo. Retorna {t: total}, ou None se alguma consulta falhar.
+    """
+    thresholds = sorted(set(thresholds))
+    chunks = [thresholds[i:i + PROBES_PER_QUERY] for i in range(0, len(thresholds), PROBES_PER_QUERY)]
+
+    def countChunk(chunk):
+        query = "{ " + " ".join(
+            f'c{stars}: search(query: "stars:>={stars}", type: REPOSITORY, first: 1) {{ repositoryCount }}'
+            for stars in chunk
+        ) + " }"
+        data = postQuery(query, f"contagem de {len(chunk)} limiares")
+        if data is None:
+            return None
+        return {stars: data['data'][f"c{stars}"]['repositoryCount'] for stars in chunk}
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(chunks))) as executor:
+        results = list(executor.map(countChunk, chunks))
+    if any(result is None for result in results):
+        return None
+    return {stars: total for result in results for stars, total in result.items()}
+
+
+def _bracket(known, target):
+    """Maior limiar conhecido com pelo menos `target` repositórios e o limiar conhecido logo acima dele (ou None)."""
+    thresholds = sorted(known)
+    low = thresholds[0]
+    for stars in thresholds:
+        if known[stars] < target:
+            return low, stars
+        low = stars
+    return low, None
+
+
+def planStarRanges(totalRepos, parts=MAX_WORKERS, count=countRepositories):
+    """
+    Divide os `totalRepos` repositórios mais estrelados em até `parts` faixas de estrelas disjuntas com quantidades
+    parecidas, para que todas sejam buscadas em paralelo com o mesmo número de páginas. Os limites saem dos dados:
+    uma rodada de contagens em limiares geométricos e rodadas de refinamento entre os limiares mais próximos de cada
+    limite, até a diferença ficar abaixo de uma tolerância. A última faixa recebe apenas o que falta para o total, então
+    a união das faixas é o top-N da busca sem divisão. Retorna [(faixa, cota)] da mais estrelada para a menos estrelada.
+    """
+    probes = [MIN_STARS]
+    while probes[-1] < PROBE_MAX_STARS:
+        probes.append(min(PROBE_MAX_STARS, math.ceil(probes[-1] * PROBE_GROWTH)))
+
+    targets = [math.ceil(totalRepos * part / parts) for part in range(1, parts + 1)]
+    tolerance = max(1, totalRepos // (parts * 8))
+    known = {}
+    for _ in range(MAX_PROBE_ROUNDS):
+        counts = count(probes)
+        if counts is None:
+            print("⚠️ Não foi possível contar os repositórios por faixa de estrelas; buscando em uma única faixa.")
+            return [(f">={MIN_STARS}", totalRepos)]
+        known.update(counts)
+
+        probes = set()
+        for target in targets:
+            low, high = _bracket(known, target)
+            if high is None or high - low <= 1 or known[low] - known[high] <= tolerance:
+                continue
+            step = (high - low) / (PROBES_PER_BOUNDARY + 1)
+            probes.update(round(low + step * i) for i in range(1, PROBES_PER_BOUNDARY + 1))
+        probes = sorted(probes - known.keys())
+        if not probes:
+            break
+
+    # Cada limite é o maior limiar com pelo menos a quantidade desejada de repositórios a partir dele
+    boundaries = sorted({_bracket(known, target)[0] for target in targets}, reverse=True)
+    plan = []
+    upper = None
+    above = 0
+    for stars in boundaries:
+        quota = min(known[stars], totalRepos) - above
+        if quota > 0:
+            plan.append((f">={stars}" if upper is None else f"{stars}..{upper - 1}", quota))
+            above += quota
+            upper = stars
+    return plan
+
+
+def fetchShard(starRange, quota, batchSize=PAGE_SIZE):
+    """Busca os `quota` repositórios mais estrelados de uma faixa de estrelas, paginando pelo cursor."""
+    shardRepos = []
     cursor = None
-    totalRepos = 1000  # Número total de repositórios desejado
-    batchSize = 25  # Repositórios por chamada
-    numBatches = totalRepos // batchSize  # Total de chamadas necessárias
+    numBatches = math.ceil(quota / batchSize)
 
     for batch in range(numBatches):
-        print(f"🔄 Buscando repositórios... (Chamada {batch + 1}/{numBatches})")
-
         query = f"""
         {{
-          search(query: "stars:>10000", type: REPOSITORY, first: {batchSize}, after: {json.dumps(cursor) if cursor else "null"}) {{
+          search(query: "stars:{starRange} sort:stars-desc", type: REPOSITORY, first: {min(batchSize, quota - len(shardRepos))}, after: {json.dumps(cursor) if cursor else "null"}) {{
             edges {{
               node {{
                 ... on Repository {{
@@ -58,36 +177,63 @@ def fetchRepositories():
         }}
         """
 
-        for attempt in range(3):
-            response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query}, headers=headers, )
+        data = postQuery(query, f"stars:{starRange}")
+        if data is None:
+            break
+
+        repositories = data['data']['search']['edges']
+        shardRepos.extend(repositories)
+
+        # Atualizar cursor para a próxima página da faixa
+        pageInfo = data['data']['search']['pageInfo']
+        print(f"✅ [stars:{starRange}] Página {batch + 1}/{numBatches} concluída ({len(shardRepos)}/{quota} repositórios)")
+        if not repositories or not pageInfo["hasNextPage"]:
+            break
+        cursor = pageInfo["endCursor"]
 
-            if response.status_code == 200:
-                data = response.json()
-                repositories = data['data']['search']['edges']
+    if len(shardRepos) < quota:
+        print(f"⚠️ [stars:{starRange}] Apenas {len(shardRepos)}/{quota} repositórios retornados pela busca.")
+    return shardRepos[:quota]
 
-                if not repositories:
-                    print("⚠️ Nenhum repositório encontrado.")
-                    return None
 
-                allRepos.extend(repositories)
+def fetchRepositories(totalRepos=1000, maxWorkers=MAX_WORKERS):
+    """
+    Busca os `totalRepos` repositórios mais estrelados com mais de 10000 estrelas dividindo a busca em faixas de
+    estrelas de tamanhos parecidos (`planStarRanges`), buscadas em paralelo e cada uma ordenada por estrelas.
+    """
+    plan = planStarRanges(totalRepos, maxWorkers)
+    print(f"🔄 Buscando {totalRepos} repositórios em {len(plan)} faixas de estrelas: "
+          + ", ".join(f"{starRange} ({quota})" for starRange, quota in plan) + "...")
+    # Páginas ainda por buscar em todas as faixas, para a previsão de término
+    getClient().scheduler.report(pending_calls=sum(math.ceil(quota / PAGE_SIZE) for _, quota in plan))
 
-                # Atualizar cursor para a próxima página
-                pageInfo = data['data']['search']['pageInfo']
-                cursor = pageInfo["endCursor"] if pageInfo["hasNextPage"] else None
+    allRepos = []
+    with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+        for shardRepos in executor.map(lambda shard: fetchShard(*shard), plan):
+            allRepos.extend(shardRepos)
+
+    # Remover duplicados (um repositório pode mudar de faixa durante a coleta)
+    uniqueRepos = {}
+    for repo in allRepos:
+        node = repo['node']
+        uniqueRepos.setdefault((node['owner']['login'], node['name']), repo)
 
-                print(
-                    f"✅ Chamada {batch + 1}/{numBatches} concluída com sucesso! ({len(allRepos)}/{totalRepos} repositórios coletados)\n")
-                break
+    mergedRepos = sorted(uniqueRepos.values(), key=lambda repo: repo['node']['stargazerCount'], reverse=True)[:totalRepos]
 
-            else:
-                print(f"⚠️ Erro {response.status_code}: {response.text}. Tentativa {attempt + 1}/3...")
-                time.sleep(5)
+    if not mergedRepos:
+        print("⚠️ Nenhum repositório encontrado.")
+        return None
 
-    return allRepos
+    print(f"✅ Busca concluída! ({len(mergedRepos)}/{totalRepos} repositórios coletados)\n")
+    getClient().scheduler.report()
+    return mergedRepos
 
 
-def processData(repositories):
-    """Processa os dados da API para um DataFrame."""
+def processData(repositories, referenceTime=None):
+    """
+    Processa os dados da API para um DataFrame. As datas são convertidas aqui, uma única vez,
+    e as idades são calculadas em relação a um único instante de referência.
+    """
     repoList = []
 
     for repo in repositories:
@@ -105,100 +251,88 @@ def processData(repositories):
             "Linguagem Principal": node['primaryLanguage']['name'] if node['primaryLanguage'] else "Desconhecido"
         })
 
-    return pd.DataFrame(repoList)
-
-def plotGraphs(df):
+    return addTimeColumns(pd.DataFrame(repoList), referenceTime)
+
+def addTimeColumns(df, referenceTime=None):
+    """
+    Converte as colunas de data para datetime UTC e acrescenta as idades em relação a `referenceTime`
+    (o momento da coleta, se não informado), guardado em ISO 8601 em `df.attrs["reference_time"]`
+    para que seja gravado junto com o Parquet.
+    """
+    referenceTime = referenceTime if referenceTime is not None else pd.Timestamp.now(tz="UTC")
+    for column in DATE_COLUMNS:
+        df[column] = pd.to_datetime(df[column], utc=True)
+    df["Idade (anos)"] = ((referenceTime - df["Data de Criação"]).dt.days / 365.25).round(1)
+    df["Dias Desde Última Atualização"] = (referenceTime - df["Última Atualização"]).dt.total_seconds() / (60 * 60 * 24)
+    df.attrs["reference_time"] = referenceTime.isoformat()
+    return df
+
+def buildLanguageCube(df):
+    """
+    Agrega os repositórios por linguagem num único groupby: quantidade, somas e médias de estrelas,
+    PRs, releases e issues, e a recência (dias desde a última atualização). Ordenado pelo número de
+    repositórios; todas as tabelas e gráficos por linguagem são montados a partir dele.
+    """
+    cube = df.groupby("Linguagem Principal", observed=True).agg(**{
+        "Repositórios": ("Nome", "size"),
+        "Estrelas": ("Estrelas", "sum"),
+        "Pull Requests Aceitos": ("Pull Requests Aceitos", "sum"),
+        "Releases": ("Releases", "sum"),
+        "Total de Issues Abertas": ("Total de Issues Abertas", "sum"),
+        "Total de Issues Fechadas": ("Total de Issues Fechadas", "sum"),
+        "Média_Estrelas": ("Estrelas", "mean"),
+        "Média_PRs_Aceitos": ("Pull Requests Aceitos", "mean"),
+        "Média_Releases": ("Releases", "mean"),
+        "Média_Issues_Abertas": ("Total de Issues Abertas", "mean"),
+        "Média_Issues_Fechadas": ("Total de Issues Fechadas", "mean"),
+        "Dias Desde Última Atualização": ("Dias Desde Última Atualização", "min"),
+        "Média_Dias_Desde_Última_Atualização": ("Dias Desde Última Atualização", "mean"),
+    })
+    return cube.sort_values("Repositórios", ascending=False, kind="stable")
+
+def plotGraphs(df, languageCube=None):
     """Gera gráficos com base nos dados coletados, mostrando apenas o top 10."""
     if df is None or df.empty:
         print("⚠️ Sem dados suficientes para gerar gráficos.")
         return
 
-    plt.rcParams.update({'font.size': 10})
-
     # Selecionar apenas o top 10 por estrelas
-    df_top10 = df.sort_values(by="Estrelas", ascending=False).head(10)
-
-    # Gráfico de barras: Estrelas por repositório (Top 10)
-    plt.figure(figsize=(12, 6))
-    plt.barh(df_top10["Nome"], df_top10["Estrelas"], color="skyblue")
-    plt.xlabel("Número de Estrelas")
-    plt.ylabel("Repositório")
-    plt.title("Top 10 Repositórios por Número de Estrelas")
-    plt.gca().invert_yaxis()
-    plt.tight_layout()
-    plt.show()
-
-    # Gráfico de pizza: Linguagens mais usadas (Top 10 repositórios)
-    languageCounts = df_top10["Linguagem Principal"].value_counts()
-    plt.figure(figsize=(8, 8))
-    languageCounts.plot(kind="pie", autopct="%1.1f%%", startangle=140, cmap="Set3")
-    plt.title("Distribuição das Linguagens de Programação (Top 10 Repositórios)")
-    plt.ylabel("")
-    plt.tight_layout()
-    plt.show()
-
-    # Gráfico de dispersão: PRs x Issues (Top 10 repositórios)
-    plt.figure(figsize=(8, 6))
-    plt.scatter(df_top10["Pull Requests Aceitos"], df_top10["Total de Issues Abertas"], color="orange", alpha=0.7)
-    plt.xlabel("Pull Requests Aceitos")
-    plt.ylabel("Total de Issues")
-    plt.title("Pull Requests Aceitos vs Total de Issues (Top 10 Repositórios)")
-    plt.tight_layout()
-    plt.show()
+    top10 = df.sort_values(by="Estrelas", ascending=False).head(10)
+    df_top10 = top10[["Nome", "Estrelas", "Pull Requests Aceitos", "Total de Issues Abertas"]]
+    languageCounts = top10["Linguagem Principal"].value_counts()
+    languageCounts = languageCounts[languageCounts > 0]  # Coluna categórica também conta linguagens ausentes
 
     # ======= NOVO: Análise das Linguagens mais populares =======
-    top_languages = df["Linguagem Principal"].value_counts().head(10)
+    if languageCube is None:
+        languageCube = buildLanguageCube(df)
+    top_languages = languageCube["Repositórios"].head(10)
 
     print("\n==================== Linguagens Mais Populares ====================\n")
     print(top_languages.to_string(header=False))
 
-    plt.figure(figsize=(10, 5))
-    top_languages.sort_values().plot(kind='barh', color='royalblue')
-    plt.xlabel("Número de Repositórios")
-    plt.ylabel("Linguagem")
-    plt.title("Top 10 Linguagens Mais Utilizadas")
-    plt.grid(axis='x', linestyle='--', alpha=0.7)
-    plt.show()
-
-    # Gráfico de barras agrupadas por linguagem
-    top_languages = df["Linguagem Principal"].value_counts().head(5).index
-    df_lang = df[df["Linguagem Principal"].isin(top_languages)]
-    df_metrics = df_lang.groupby("Linguagem Principal")[["Pull Requests Aceitos", "Releases"]].sum()
-    df_metrics["Dias Desde Última Atualização"] = (pd.to_datetime("today") - pd.to_datetime(df_lang.groupby("Linguagem Principal")["Última Atualização"].max()).dt.tz_localize(None)).dt.days
+    df_metrics = languageCube.head(5)[["Pull Requests Aceitos", "Releases", "Dias Desde Última Atualização"]].astype(int)
 
-    
-    df_metrics.plot(kind='bar', figsize=(10, 6), colormap='viridis')
-    plt.title("Métricas por Linguagem Popular")
-    plt.ylabel("Quantidade")
-    plt.xlabel("Linguagem")
-    plt.xticks(rotation=45)
-    plt.legend(["PR Aceitos", "Releases", "Dias Desde Última Atualização"])
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.show()
-    
+    return chart_renderer.render([
+        chart_renderer.chart("top10_estrelas", charts.drawTopRepositories, df_top10, (12, 6)),
+        chart_renderer.chart("linguagens_top10_repositorios", charts.drawLanguagePie, languageCounts, (8, 8)),
+        chart_renderer.chart("prs_vs_issues", charts.drawPullRequestsVsIssues, df_top10, (8, 6)),
+        chart_renderer.chart("top10_linguagens", charts.drawTopLanguages, top_languages, (10, 5)),
+        chart_renderer.chart("metricas_por_linguagem", charts.drawLanguageMetrics, df_metrics, (10, 6)),
+    ])
 
 
-def printLanguageStats(df):
+def printLanguageStats(df, languageCube=None):
     """Exibe uma tabela com as 10 linguagens mais populares, média de PRs aceitos, média de releases e média de dias desde a última atualização."""
     if df is None or df.empty:
         print("⚠️ Sem dados suficientes para análise.")
         return
 
-    # Converter a coluna de data para datetime
-    df["Última Atualização"] = pd.to_datetime(df["Última Atualização"])
-    df["Dias Desde Última Atualização"] = (pd.to_datetime("today", utc=True) - df["Última Atualização"]).dt.total_seconds() / (60 * 60 * 24)
-
-
-    # Filtrar as 10 linguagens mais populares
-    top_languages = df["Linguagem Principal"].value_counts().head(10).index
-    df_top_languages = df[df["Linguagem Principal"].isin(top_languages)]
-    
-    # Agrupar por linguagem e calcular médias
-    df_stats = df_top_languages.groupby("Linguagem Principal").agg(
-        Média_PRs_Aceitos=("Pull Requests Aceitos", "mean"),
-        Média_Releases=("Releases", "mean"),
-        Média_Dias_Desde_Última_Atualização=("Dias Desde Última Atualização", "mean")
-    ).round(2)
+    # Médias das 10 linguagens mais populares, já calculadas no agregado por linguagem
+    if languageCube is None:
+        languageCube = buildLanguageCube(df)
+    df_stats = languageCube.head(10)[
+        ["Média_PRs_Aceitos", "Média_Releases", "Média_Dias_Desde_Última_Atualização"]
+    ].round(2)
     
     # Exibir a tabela
     print("\n==================== Estatísticas das 10 Linguagens Mais Populares ====================\n")
@@ -206,27 +340,17 @@ def printLanguageStats(df):
 
     return df_stats
 
-def plot_top_languages(df):
+def plot_top_languages(df, languageCube=None):
     """Gera um gráfico com as 10 linguagens mais populares nos repositórios coletados."""
     if df is None or df.empty:
         print("⚠️ Sem dados suficientes para gerar gráficos.")
         return
 
     # Contar as ocorrências das linguagens e pegar o top 10
-    top_languages = df["Linguagem Principal"].value_counts().head(10)
-
-    # Criando o gráfico
-    plt.figure(figsize=(12, 6))
-    top_languages.sort_values().plot(kind='barh', color='royalblue', edgecolor='black')
-
-    # Adicionando rótulos e título
-    plt.xlabel("Número de Repositórios")
-    plt.ylabel("Linguagem")
-    plt.title("Top 10 Linguagens Mais Utilizadas nos Repositórios do GitHub")
-
-    # Melhorando a legibilidade
-    plt.grid(axis='x', linestyle='--', alpha=0.7)
-    plt.gca().invert_yaxis()
+    if languageCube is None:
+        languageCube = buildLanguageCube(df)
+    top_languages = languageCube["Repositórios"].head(10)
 
-    # Exibir gráfico
-    plt.show()
\ No newline at end of file
+    return chart_renderer.render([
+        chart_renderer.chart("top10_linguagens_repositorios", charts.drawTopLanguagesDetailed, top_languages, (12, 6)),
+    ])
@@ -1,78 +1,55 @@
-from datetime import datetime, timezone
-
 import pandas as pd
 
-
-def calculate_mean(data):
-    mean_values = [{}]
-
-    for key, values in data.items():
-        mean = values.mean()
-        mean_values[0][key] = round(float(mean), 2)
-    return pd.DataFrame(mean_values)
-
-
-def calculate_median(data):
-    median_values = [{}]
-
-    for key, values in data.items():
-        median = values.median()
-        median_values[0][key] = round(float(median), 2)
-    return pd.DataFrame(median_values)
-
-
-def calculate_mode(data):
-    mode_values = [{}]
-
-    for key, values in data.items():
-        mode = values.mode()
-        mode_values[0][key] = mode.tolist()
-    return pd.DataFrame(mode_values)
-
-
-def calculate_last_update_statistics(data):
-    data_values = data.values
-    last_update_values = []
-
-    for value in data_values:
-        last_update = pd.to_datetime(value[0])
-        last_update_values.append(last_update)
-
-    series_value = pd.Series(last_update_values)
-    mean = series_value.mean()
-    median = series_value.median()
-    mode = series_value.mode()
-
-    return {
-        'mean': mean,
-        'median': median,
-        'mode': mode
-    }
-
-
-def calculate_repositories_middle_age(data):
-    repos_age = []
-    data_values = data.values
-
-    for value in data_values:
-        creation_date = pd.to_datetime(value[0])
-        age = datetime.now(timezone.utc) - creation_date
-        repos_age.append(age.days)
-
-    series_value = pd.Series(repos_age)
-    middle_age = series_value.mean() / 365.25
-    return round(float(middle_age), 1)
-
-def calculate_repositories_median_age(data):
-    repos_age = []
-    data_values = data.values
-
-    for value in data_values:
-        creation_date = pd.to_datetime(value[0])
-        age = datetime.now(timezone.utc) - creation_date
-        repos_age.append(age.days)
-
-    series_value = pd.Series(repos_age)
-    median_age = series_value.median() / 365.25
-    return round(float(median_age), 1)
+DAYS_PER_YEAR = 365.25
+AGE_QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+
+def parse_dates(values):
+    """Converte uma coluna de datas para datetime UTC de uma vez; colunas já convertidas são devolvidas como estão."""
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        return values
+    return pd.to_datetime(values, utc=True)
+
+
+def calculate_statistics(data, numeric_columns, date_columns, reference_time=None):
+    """
+    Calcula de uma vez média, mediana e moda das colunas numéricas e, para as colunas de data,
+    média/mediana/moda das datas e a distribuição de idades (em anos).
+    Retorna uma tabela longa com as colunas Coluna, Estatística e Valor.
+    `reference_time` (Timestamp ou texto ISO 8601) fixa o instante usado nas idades; o padrão é agora.
+    """
+    reference_time = pd.Timestamp(reference_time) if reference_time is not None else pd.Timestamp.now(tz="UTC")
+    rows = []
+
+    numeric = data[numeric_columns]
+    means = numeric.mean()
+    medians = numeric.median()
+    for column in numeric_columns:
+        rows.append((column, "média", round(float(means[column]), 2)))
+        rows.append((column, "mediana", round(float(medians[column]), 2)))
+        rows.append((column, "moda", numeric[column].mode().tolist()))
+
+    for column in date_columns:
+        dates = parse_dates(data[column])
+        ages = (reference_time - dates).dt.days / DAYS_PER_YEAR
+        rows.append((column, "média", dates.mean()))
+        rows.append((column, "mediana", dates.median()))
+        rows.append((column, "moda", dates.mode().tolist()))
+        rows.append((column, "idade média (anos)", round(float(ages.mean()), 1)))
+        rows.append((column, "idade mediana (anos)", round(float(ages.median()), 1)))
+        for quantile, value in ages.quantile(AGE_QUANTILES).items():
+            rows.append((column, f"idade p{int(quantile * 100)} (anos)", round(float(value), 1)))
+
+    return pd.DataFrame(rows, columns=["Coluna", "Estatística", "Valor"])
+
+
+def statistic_row(statistics, statistic, columns):
+    """Extrai uma estatística da tabela longa como uma linha com uma coluna por métrica."""
+    selected = statistics[statistics["Estatística"] == statistic].set_index("Coluna")["Valor"]
+    return pd.DataFrame([{column: selected[column] for column in columns}])
+
+
+def statistic_value(statistics, column, statistic):
+    match = statistics[(statistics["Coluna"] == column) & (statistics["Estatística"] == statistic)]
+    return match["Valor"].iloc[0]
 
@@ -0,0 +1,117 @@
+import collections
+import json
+import math
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared", "tests"))
+import graphql_stub
+import repositories_adapter
+
+# Distribuição concentrada perto de 10000 estrelas, como na busca real: poucos repositórios no topo, muitos perto do piso
+STARS = sorted({10001 + int(190000 * (k / 2500) ** 4) + k for k in range(2500)}, reverse=True)
+SEARCH = re.compile(r'search\(query: "stars:([^" ]+)( sort:stars-desc)?", type: REPOSITORY, first: (\d+)(?:, after: (null|"\d+"))?\)')
+COUNT = re.compile(r'(\w+): search\(query: "stars:([^" ]+)", type: REPOSITORY, first: 1\)')
+
+
+def in_range(stars, starRange):
+    if starRange.startswith(">="):
+        return stars >= int(starRange[2:])
+    if starRange.startswith(">"):
+        return stars > int(starRange[1:])
+    low, high = starRange.split("..")
+    return int(low) <= stars <= int(high)
+
+
+def search(starRange, first, offset):
+    """Busca de repositórios do servidor falso: filtra pela faixa e ordena por estrelas."""
+    matches = [stars for stars in STARS if in_range(stars, starRange)]
+    page = matches[offset:offset + first]
+    return {
+        "repositoryCount": len(matches),
+        "edges": [{"node": {
+            "name": f"repo{stars}", "owner": {"login": "dono"}, "stargazerCount": stars,
+            "createdAt": "2015-01-01T00:00:00Z", "updatedAt": "2024-01-01T00:00:00Z", "primaryLanguage": None,
+            "pullRequests": {"totalCount": 0}, "releases": {"totalCount": 0},
+            "openIssues": {"totalCount": 0}, "closedIssues": {"totalCount": 0},
+        }} for stars in page],
+        "pageInfo": {"hasNextPage": offset + first < len(matches), "endCursor": json.dumps(offset + first)},
+    }
+
+
+def respond(query):
+    counts = COUNT.findall(query)
+    if counts:
+        return {"data": {alias: {"repositoryCount": sum(in_range(stars, starRange) for stars in STARS)}
+                         for alias, starRange in counts}}
+    starRange, _, first, after = SEARCH.search(query).groups()
+    return {"data": {"search": search(starRange, int(first), 0 if after in (None, "null") else int(json.loads(after)))}}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Servidor GraphQL local que responde às buscas por faixa de estrelas; o módulo passa a usá-lo."""
+    with graphql_stub.GraphQLStub(respond) as stub:
+        monkeypatch.setattr(repositories_adapter, "_client", stub.client())
+        yield stub
+
+
+def names(repositories):
+    return [repo["node"]["name"] for repo in repositories]
+
+
+def pages_per_range(server):
+    pages = collections.Counter()
+    for query in server.queries:
+        if "sort:stars-desc" in query:
+            pages[SEARCH.search(query).group(1)] += 1
+    return pages
+
+
+@pytest.mark.parametrize("totalRepos", [1000, 100, 2400, 3000])
+def test_sharded_fetch_matches_unsharded_top_n(server, totalRepos):
+    unsharded = repositories_adapter.fetchShard(f">{repositories_adapter.MIN_STARS - 1}", totalRepos)
+    sharded = repositories_adapter.fetchRepositories(totalRepos)
+
+    assert len(sharded) == min(totalRepos, len(STARS))
+    assert names(sharded) == names(unsharded)
+
+
+def test_pages_are_spread_evenly_across_ranges(server):
+    totalRepos = 1000
+    repositories_adapter.fetchRepositories(totalRepos)
+
+    # Cada faixa busca cerca de 1000 / 8 = 125 repositórios: 5 ou 6 páginas de 25, em vez de quase tudo numa faixa só
+    pages = pages_per_range(server)
+    assert len(pages) == repositories_adapter.MAX_WORKERS
+    assert max(pages.values()) - min(pages.values()) <= 1
+    assert max(pages.values()) <= math.ceil(totalRepos / repositories_adapter.MAX_WORKERS / 25) + 1
+
+    # As contagens que definem as faixas custam poucas rodadas de consultas
+    count_queries = [query for query in server.queries if COUNT.search(query)]
+    assert len(count_queries) <= 2 * repositories_adapter.MAX_PROBE_ROUNDS
+
+
+def test_plan_ranges_are_disjoint_and_cover_the_top_n():
+    def count(thresholds):
+        return {stars: sum(value >= stars for value in STARS) for stars in thresholds}
+
+    plan = repositories_adapter.planStarRanges(1000, 8, count)
+
+    assert sum(quota for _, quota in plan) == 1000
+    assert plan[0][0].startswith(">=")
+    lower_bounds = [int(starRange.lstrip(">=").split("..")[0]) for starRange, _ in plan]
+    for (starRange, _), upper in zip(plan[1:], lower_bounds):
+        assert starRange.split("..")[1] == str(upper - 1)
+    assert all(abs(quota - 125) <= 1000 // 64 for _, quota in plan[:-1])
+
+
+def test_count_failure_falls_back_to_a_single_range():
+    plan = repositories_adapter.planStarRanges(1000, 8, lambda thresholds: None)
+
+    assert plan == [(f">={repositories_adapter.MIN_STARS}", 1000)]
@@ -0,0 +1,54 @@
+import argparse
+import os
+import time
+
+from pygount import ProjectSummary, SourceAnalysis
+
+import line_counter
+
+
+def count_lines_pygount(repo_path):
+    """Implementação anterior: um os.walk e um SourceAnalysis por arquivo, tudo numa única thread."""
+    summary = ProjectSummary()
+    for root, _, files in os.walk(repo_path):
+        for file in files:
+            if file.endswith(".java"):
+                analysis = SourceAnalysis.from_file(os.path.join(root, file), "java", encoding="utf-8")
+                summary.add(analysis)
+    return summary.total_code_count, summary.total_documentation_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a contagem de linhas atual com a implementação anterior.")
+    parser.add_argument('repo_paths', nargs='+', help='Repositórios Java já clonados')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='Processos da contagem paralela')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    legacy = [count_lines_pygount(path) for path in args.repo_paths]
+    legacy_seconds = time.perf_counter() - started
+
+    with line_counter.create_pool(args.workers) as pool:
+        started = time.perf_counter()
+        cold = [line_counter.count_lines(path, pool=pool) for path in args.repo_paths]
+        cold_seconds = time.perf_counter() - started
+
+        # Segunda passada: todos os blobs já estão em LINE_COUNT_CACHE
+        started = time.perf_counter()
+        warm = [line_counter.count_lines(path, pool=pool) for path in args.repo_paths]
+        warm_seconds = time.perf_counter() - started
+
+    for path, expected, result in zip(args.repo_paths, legacy, cold):
+        status = "✅" if expected == result else "❌"
+        print(f"{status} {path}: pygount={expected} paralelo={result}")
+
+    print(f"\nPygount sequencial:      {legacy_seconds:.2f}s")
+    print(f"Paralelo ({args.workers} processos): {cold_seconds:.2f}s ({legacy_seconds / cold_seconds:.1f}x)")
+    print(f"Paralelo com cache:      {warm_seconds:.2f}s")
+
+    if legacy != cold or cold != warm:
+        raise SystemExit("❌ Os totais divergem da implementação anterior.")
+
+
+if __name__ == "__main__":
+    main()
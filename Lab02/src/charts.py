@@ -0,0 +1,24 @@
+"""Funções de desenho dos gráficos do Lab02. Cada uma recebe a figura e só os dados de que precisa."""
+
+QUALITY_METRICS = ['Média CBO (Classes)', 'Média DIT (Classes)', 'Média LCOM (Classes)']
+
+
+def drawQualityScatter(fig, df):
+    """Popularidade (linha de cima) e maturidade (linha de baixo) contra cada métrica de qualidade."""
+    axes = fig.subplots(2, len(QUALITY_METRICS), squeeze=False)
+    fig.suptitle('Popularidade vs Métricas de Qualidade e Maturidade vs Métricas de Qualidade')
+
+    for i, metric in enumerate(QUALITY_METRICS):
+        ax1 = axes[0, i]
+        ax1.scatter(df['Estrelas'], df[metric], color='blue', alpha=0.5)
+        ax1.set_title(f'Popularidade vs {metric}')
+        ax1.set_xlabel('Estrelas')
+        ax1.set_ylabel(metric)
+        ax1.grid(True)
+
+        ax2 = axes[1, i]
+        ax2.scatter(df['Idade'], df[metric], color='green', alpha=0.5)
+        ax2.set_title(f'Maturidade vs {metric}')
+        ax2.set_xlabel('Idade (anos)')
+        ax2.set_ylabel(metric)
+        ax2.grid(True)
@@ -0,0 +1,77 @@
+import com.github.mauricioaniche.ck.CK;
+import com.github.mauricioaniche.ck.CKClassResult;
+import com.github.mauricioaniche.ck.CKNotifier;
+import com.github.mauricioaniche.ck.ResultWriter;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.UncheckedIOException;
+import java.nio.charset.StandardCharsets;
+
+/**
+ * Processo CK residente: lê jobs "caminho_do_repositorio<TAB>prefixo_de_saida" da entrada padrão,
+ * analisa cada repositório com os mesmos parâmetros usados via linha de comando
+ * (useJars=true, maxAtOnce=0, variablesAndFields=true) e responde uma linha de protocolo por job.
+ */
+public class CKWorker {
+
+    private static final String MARKER = "@@CK@@";
+
+    public static void main(String[] args) throws Exception {
+        BufferedReader input = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        System.out.println(MARKER + "\tREADY");
+        System.out.flush();
+
+        String line;
+        while ((line = input.readLine()) != null) {
+            String[] job = line.split("\t", 2);
+            if (job.length != 2) {
+                reply("FAIL", "job inválido: " + line);
+                continue;
+            }
+
+            try {
+                analyze(job[0], job[1]);
+                reply("DONE", job[0]);
+            } catch (Throwable e) {
+                reply("FAIL", e.getClass().getSimpleName() + ": " + e.getMessage());
+            }
+        }
+    }
+
+    private static void analyze(String repoPath, String outputPrefix) throws Exception {
+        ResultWriter writer = new ResultWriter(
+            outputPrefix + "class.csv",
+            outputPrefix + "method.csv",
+            outputPrefix + "variable.csv",
+            outputPrefix + "field.csv",
+            true
+        );
+
+        try {
+            // Cada classe é gravada assim que o CK a notifica, sem acumular os resultados do repositório
+            new CK(true, 0, true).calculate(repoPath, new CKNotifier() {
+                @Override
+                public void notify(CKClassResult result) {
+                    try {
+                        writer.printResult(result);
+                    } catch (IOException e) {
+                        throw new UncheckedIOException(e);
+                    }
+                }
+
+                public void notifyError(String sourceFilePath, Exception e) {
+                    System.err.println("Erro ao analisar " + sourceFilePath + ": " + e.getMessage());
+                }
+            });
+        } finally {
+            writer.flushAndClose();
+        }
+    }
+
+    private static void reply(String status, String message) {
+        System.out.println(MARKER + "\t" + status + "\t" + message.replace('\n', ' '));
+        System.out.flush();
+    }
+}
@@ -0,0 +1,89 @@
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from git import Repo
+from pygount import SourceAnalysis
+
+# Contagem de linhas por SHA de blob: arquivos idênticos (ex.: código copiado entre projetos) são contados uma vez
+LINE_COUNT_CACHE = {}
+
+
+def create_pool(workers):
+    """
+    Cria o pool de processos da contagem de linhas. Usa "spawn" porque o pool convive com threads que
+    disparam `git` via subprocess, e um fork nesse momento pode herdar pipes abertos e travar o clone.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def find_java_files(repo_path):
+    """Percorre a árvore uma única vez e retorna (caminho, SHA do blob git) de cada arquivo .java."""
+    java_files = []
+    for root, dirs, files in os.walk(repo_path):
+        if ".git" in dirs:
+            dirs.remove(".git")
+        for file in files:
+            if file.endswith(".java"):
+                java_files.append(os.path.join(root, file))
+
+    blob_shas = git_blob_shas(repo_path)
+    return [
+        (file_path, blob_shas.get(os.path.relpath(file_path, repo_path).replace(os.sep, "/")) or hash_blob(file_path))
+        for file_path in java_files
+    ]
+
+
+def git_blob_shas(repo_path):
+    """Lê os SHAs dos blobs .java direto do índice do git, sem precisar ler o conteúdo dos arquivos."""
+    try:
+        output = Repo(repo_path).git.ls_files("-s", "--", "*.java")
+    except Exception:
+        return {}
+    blob_shas = {}
+    for line in output.splitlines():
+        info, _, path = line.partition("\t")
+        blob_shas[path] = info.split()[1]
+    return blob_shas
+
+
+def hash_blob(file_path):
+    """Calcula o SHA do blob como o git faria, para arquivos fora de um repositório git."""
+    with open(file_path, "rb") as file:
+        content = file.read()
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def count_lines(repo_path, java_files=None, pool=None):
+    """
+    Soma as linhas de código e de comentário dos arquivos .java do repositório.
+    Arquivos já contados (mesmo SHA de blob, inclusive em outros repositórios) vêm de LINE_COUNT_CACHE;
+    os demais são analisados em paralelo no `pool` de processos, quando informado.
+    """
+    if java_files is None:
+        java_files = find_java_files(repo_path)
+
+    missing = {}
+    for file_path, blob_sha in java_files:
+        if blob_sha not in LINE_COUNT_CACHE:
+            missing.setdefault(blob_sha, file_path)
+
+    if missing:
+        paths = list(missing.values())
+        counts = pool.map(count_file_lines, paths, chunksize=64) if pool else map(count_file_lines, paths)
+        for blob_sha, file_counts in zip(missing, counts):
+            LINE_COUNT_CACHE[blob_sha] = file_counts
+
+    code_lines = sum(LINE_COUNT_CACHE[blob_sha][0] for _, blob_sha in java_files)
+    comment_lines = sum(LINE_COUNT_CACHE[blob_sha][1] for _, blob_sha in java_files)
+
+    return code_lines, comment_lines
+
+
+def count_file_lines(file_path):
+    """Conta um único arquivo com o pygount; mesmo critério do ProjectSummary (só arquivos contáveis)."""
+    analysis = SourceAnalysis.from_file(file_path, "java", encoding="utf-8")
+    if not analysis.is_countable:
+        return 0, 0
+    return analysis.code_count, analysis.documentation_count
@@ -1,24 +1,46 @@
 import argparse
+import os
+import sys
+
 import pandas as pd
-import repositories_adapter
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+import checkpoint
 
 def main():
+    # Importado aqui: os processos da contagem de linhas (spawn) reimportam este módulo e não devem criar o cliente da API
+    import repositories_adapter
+
     # Argumentos para start, end e quiet
     parser = argparse.ArgumentParser()
     parser.add_argument('--start', type=int, default=0, help='Índice de início')
     parser.add_argument('--end', type=int, default=1000, help='Índice final')
     parser.add_argument('--quiet', action='store_true', help='Suprimir a saída no terminal')
+    parser.add_argument('--reset-checkpoint', action='store_true', help='Ignorar o progresso salvo e recomeçar a coleta')
+    parser.add_argument('--clone-workers', type=int, default=repositories_adapter.CLONE_WORKERS, help='Clones simultâneos')
+    parser.add_argument('--line-workers', type=int, default=repositories_adapter.LINE_WORKERS, help='Processos para contagem de linhas')
+    parser.add_argument('--ck-workers', type=int, default=repositories_adapter.CK_WORKERS, help='Execuções simultâneas do CK (JVMs residentes)')
+    parser.add_argument('--ck-daemon', action='store_true', help='Rodar o CK em JVMs residentes em vez de uma JVM por repositório (experimental)')
     args = parser.parse_args()
 
+    # Progresso salvo por intervalo: uma execução interrompida continua de onde parou
+    collection_checkpoint = checkpoint.Checkpoint(os.path.join('Lab02', 'checkpoints', f'lab02_{args.start}_{args.end}'))
+    if args.reset_checkpoint:
+        collection_checkpoint.clear()
+
     # Condicional para suprimir a saída se o --quiet for fornecido
     if not args.quiet:
         print("Iniciando a coleta de dados dos repositórios...")
 
     # Passar start e end para fetchRepositories
-    repositories = repositories_adapter.fetchRepositories(args.start, args.end)
+    repositories = repositories_adapter.fetchRepositories(args.start, args.end, collection_checkpoint)
 
     if repositories:
-        df = repositories_adapter.processData(repositories)
+        df = repositories_adapter.processData(
+            repositories, collection_checkpoint,
+            cloneWorkers=args.clone_workers, lineWorkers=args.line_workers, ckWorkers=args.ck_workers,
+            ckDaemon=args.ck_daemon
+        )
 
         if df is not None:
             pd.set_option('display.max_rows', None)
@@ -5,16 +5,113 @@ import pandas as pd
 
 
 import os
+import queue
 import subprocess
 
-def run_ck(repo_path, output_path, ck_dir):
+CK_JAR_PATH = "Lab02/src/ck-0.7.1-SNAPSHOT-jar-with-dependencies.jar"
+CK_WORKER_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ck_worker", "CKWorker.java")
+CK_WORKER_MARKER = "@@CK@@"
+
+
+class CKWorkerPool:
+    """
+    Mantém JVMs do CK abertas e distribui os repositórios entre elas pela entrada padrão (ver ck_worker/CKWorker.java),
+    evitando o custo de iniciar uma JVM e aquecer o JIT para cada repositório.
+    """
+
+    def __init__(self, workers, ck_jar_path=CK_JAR_PATH):
+        self.ck_jar_path = ck_jar_path
+        self.classes_dir = compile_ck_worker(ck_jar_path)
+        self._idle = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(self._start_worker())
+
+    def run(self, repo_path, output_path):
+        """Analisa um repositório numa JVM livre. Retorna True se o CK terminou sem erro."""
+        worker = self._idle.get()
+        try:
+            if worker.poll() is not None:
+                worker = self._start_worker()
+            worker.stdin.write(f"{repo_path}\t{output_path}\n")
+            worker.stdin.flush()
+            status, message = self._read_reply(worker)
+        except (OSError, EOFError) as e:
+            status, message = "FAIL", f"worker do CK encerrou: {e}"
+            worker.kill()
+            worker = self._start_worker()
+        finally:
+            self._idle.put(worker)
+
+        if status == "DONE":
+            print(f"Análise concluída para o repositório {repo_path}. Resultados em {output_path}")
+            return True
+        print(f"Erro ao executar o CK para o repositório {repo_path}: {message}")
+        return False
+
+    def close(self):
+        while not self._idle.empty():
+            worker = self._idle.get()
+            worker.stdin.close()
+            worker.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start_worker(self):
+        classpath = os.pathsep.join([self.ck_jar_path, self.classes_dir])
+        worker = subprocess.Popen(
+            ["java", "-cp", classpath, "CKWorker"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8", bufsize=1,
+        )
+        status, message = self._read_reply(worker)
+        if status != "READY":
+            raise RuntimeError(f"Worker do CK não iniciou: {message}")
+        return worker
+
+    @staticmethod
+    def _read_reply(worker):
+        # O CK também escreve na saída padrão; só as linhas com o marcador fazem parte do protocolo
+        for line in worker.stdout:
+            if line.startswith(CK_WORKER_MARKER):
+                parts = line.rstrip("\n").split("\t", 2)
+                return parts[1], parts[2] if len(parts) > 2 else ""
+        raise EOFError("saída do worker fechada")
+
+
+def compile_ck_worker(ck_jar_path=CK_JAR_PATH):
+    """Compila o CKWorker contra o jar do CK (uma vez) e retorna a pasta com as classes."""
+    classes_dir = os.path.join(os.path.dirname(CK_WORKER_SOURCE), "build")
+    class_file = os.path.join(classes_dir, "CKWorker.class")
+    if not os.path.exists(class_file) or os.path.getmtime(class_file) < os.path.getmtime(CK_WORKER_SOURCE):
+        os.makedirs(classes_dir, exist_ok=True)
+        subprocess.run(["javac", "-cp", ck_jar_path, "-d", classes_dir, CK_WORKER_SOURCE], check=True)
+    return classes_dir
+
+
+def create_worker_pool(workers):
+    """Cria o pool de JVMs do CK; retorna None (execução com `java -jar` por repositório) se não for possível."""
+    try:
+        return CKWorkerPool(workers)
+    except Exception as e:
+        print(f"⚠ Workers do CK indisponíveis, usando uma JVM por repositório: {e}")
+        return None
+
+
+def run_ck(repo_path, output_path, ck_dir, worker_pool=None):
     print(ck_dir)
-    ck_jar_path = "Lab02/src/ck-0.7.1-SNAPSHOT-jar-with-dependencies.jar"
+    ck_jar_path = CK_JAR_PATH
 
     # Verifica se o caminho de saída existe, se não, cria
     if not os.path.exists(output_path):
         os.makedirs(output_path)
 
+    if worker_pool is not None:
+        worker_pool.run(repo_path, output_path)
+        return
+
     # Monta o comando Java para executar o CK
     command = [
         "java", "-jar", ck_jar_path,
@@ -39,8 +136,56 @@ def run_ck(repo_path, output_path, ck_dir):
 
 import os
 import pandas as pd
+from collections import Counter
+
+CSV_CHUNK_SIZE = 100_000  # Linhas lidas por vez dos CSVs do CK
+CK_CLASS_METRICS = ["cbo", "dit", "lcom"]
+CK_METHOD_METRICS = ["cbo"]
+
+
+class RunningDistribution:
+    """
+    Acumula uma métrica em blocos guardando apenas a contagem de cada valor distinto.
+    As métricas do CK são inteiras, então média, mediana e percentis saem exatos com memória limitada.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.total = 0
+        self.sum = 0.0
+
+    def add(self, values):
+        values = values.dropna()
+        self.total += len(values)
+        self.sum += float(values.sum())
+        self.counts.update(values.value_counts().to_dict())
+
+    def mean(self):
+        return self.sum / self.total if self.total else None
+
+    def quantile(self, q):
+        """Percentil com interpolação linear entre posições, o mesmo critério de `Series.quantile`."""
+        if not self.total:
+            return None
+        position = q * (self.total - 1)
+        lower_rank, upper_rank = int(position), min(int(position) + 1, self.total - 1)
+        lower = upper = None
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                upper = value
+                break
+        return float(lower + (upper - lower) * (position - lower_rank))
+
 
 def summarize_ck_results(output_path):
+    """
+    Resume os CSVs do CK lendo só as colunas usadas, em blocos, e combinando todos os arquivos
+    de classes e de métodos do diretório.
+    """
     if not os.path.exists(output_path) or not os.path.isdir(output_path):
         raise FileNotFoundError(f"Diretório {output_path} não encontrado!")
 
@@ -49,38 +194,47 @@ def summarize_ck_results(output_path):
     if not csv_files:
         raise FileNotFoundError(f"Nenhum arquivo CSV encontrado no diretório {output_path} !")
 
-    metrics_summary = {
-        "Média CBO (Classes)": None,
-        "Média DIT (Classes)": None,
-        "Média LCOM (Classes)": None,
-        "Média CBO (Métodos)": None,
+    distributions = {
+        "Classes": {metric: RunningDistribution() for metric in CK_CLASS_METRICS},
+        "Métodos": {metric: RunningDistribution() for metric in CK_METHOD_METRICS},
     }
 
     for csv_file in csv_files:
         file_path = os.path.join(output_path, csv_file)
-        
+
+        # O CK grava <prefixo>class.csv e <prefixo>method.csv; o prefixo é o nome do repositório
+        if csv_file.endswith("class.csv"):
+            level = "Classes"
+        elif csv_file.endswith("method.csv"):
+            level = "Métodos"
+        else:
+            continue
+
         # Verificar se o arquivo não está vazio antes de tentar ler
         if os.path.getsize(file_path) == 0:
             print(f"⚠ O arquivo {csv_file} está vazio e foi ignorado.")
-            continue  # Ignora o arquivo vazio
-        
+            continue
+
+        metrics = list(distributions[level])
         try:
-            df = pd.read_csv(file_path)
+            columns = pd.read_csv(file_path, nrows=0).columns
+            if not set(metrics).issubset(columns):
+                print(f"⚠ O arquivo {csv_file} não contém as colunas esperadas ({', '.join(metrics)}).")
+                continue
+
+            for chunk in pd.read_csv(file_path, usecols=metrics, chunksize=CSV_CHUNK_SIZE):
+                for metric in metrics:
+                    distributions[level][metric].add(pd.to_numeric(chunk[metric], errors="coerce"))
         except Exception as e:
             print(f"Erro ao ler o arquivo {csv_file}: {e}")
             continue  # Ignora arquivos que não puderam ser lidos
 
-        if csv_file.__contains__("class"):
-            if "cbo" in df.columns and "dit" in df.columns and "lcom" in df.columns:
-                metrics_summary["Média CBO (Classes)"] = df["cbo"].mean()
-                metrics_summary["Média DIT (Classes)"] = df["dit"].mean()
-                metrics_summary["Média LCOM (Classes)"] = df["lcom"].mean()
-            else:
-                print(f"⚠ O arquivo {csv_file} não contém as colunas esperadas.")
-        elif csv_file.__contains__("method"):
-            if "cbo" in df.columns:
-                metrics_summary["Média CBO (Métodos)"] = df["cbo"].mean()
-            else:
-                print(f"⚠ O arquivo {csv_file} não contém a coluna 'cbo'.")
+    metrics_summary = {}
+    for level, level_distributions in distributions.items():
+        for metric, distribution in level_distributions.items():
+            name = f"{metric.upper()} ({level})"
+            metrics_summary[f"Média {name}"] = distribution.mean()
+            metrics_summary[f"Mediana {name}"] = distribution.quantile(0.5)
+            metrics_summary[f"P90 {name}"] = distribution.quantile(0.9)
 
     return metrics_summary
@@ -1,23 +1,28 @@
-import base64
-import io
+import html
 import json
 import os
 import shutil
 import stat
 import subprocess
+import sys
 import time
-from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from string import Template
 
-import matplotlib.pyplot as plt
 import pandas as pd
-import requests
 from dotenv import load_dotenv
 from git import Repo
-from pygount import ProjectSummary, SourceAnalysis
 
+import charts
+import line_counter
 import quality_metrics_adapter
 import argparse
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+import chart_renderer
+import github_client
+
 # Carregar variáveis de ambiente
 load_dotenv()
 
@@ -29,25 +34,30 @@ API_URL = os.environ.get("API_URL")
 TOKEN = os.environ.get("TOKEN")
 ck_path = os.environ.get("CK_REPO_URL")
 
-GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
-
-headers = {
-    "Authorization": f"Bearer {TOKEN}",
-    "Content-Type": "application/json"
-}
+client = github_client.GitHubClient(TOKEN)
 
 # Limite máximo de caminho para Windows
 MAX_PATH_LENGTH = 260
 
-def fetchRepositories(start, end):
+# Arquivos mantidos no sparse checkout: a análise só lê o código Java
+SPARSE_CHECKOUT_PATTERN = "*.java"
+
+# Paralelismo de cada etapa da análise (clone: rede, linhas: CPU Python, CK: JVM)
+CLONE_WORKERS = 4
+LINE_WORKERS = os.cpu_count() or 2
+CK_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+
+def fetchRepositories(start, end, checkpoint=None):
     """Faz a requisição GraphQL com paginação para obter repositórios em intervalos definidos."""
-    allRepos = []
-    cursor = None
+    allRepos = checkpoint.get_state("repositories", []) if checkpoint else []
+    cursor = checkpoint.get_state("cursor") if checkpoint else None
+    firstBatch = checkpoint.get_state("batches_done", 0) if checkpoint else 0
     totalRepos = end - start  # Número total de repositórios desejado
     batchSize = 20  # Repositórios por chamada
     numBatches = totalRepos // batchSize  # Total de chamadas necessárias
 
-    for batch in range(numBatches):
+    for batch in range(firstBatch, numBatches):
         print(f"🔄 Buscando repositórios... (Chamada {batch + 1}/{numBatches})")
 
         query = f"""
@@ -79,7 +89,7 @@ def fetchRepositories(start, end):
         """
 
         for attempt in range(3):
-            response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query}, headers=headers)
+            response = client.post(query)
 
             if response.status_code == 200:
                 data = response.json()
@@ -101,7 +111,11 @@ def fetchRepositories(start, end):
                 pageInfo = data['data']['search']['pageInfo']
                 cursor = pageInfo["endCursor"] if pageInfo["hasNextPage"] else None
 
+                if checkpoint:
+                    checkpoint.update_state(cursor=cursor, repositories=allRepos, batches_done=batch + 1)
+
                 print(f"✅ Chamada {batch + 1}/{numBatches} concluída com sucesso! ({len(allRepos)}/{totalRepos} repositórios coletados)\n")
+                client.scheduler.report(pending_calls=numBatches - batch - 1)
                 break
 
             else:
@@ -118,68 +132,164 @@ def is_educational(repo):
 
     return any(keyword in name or keyword in description for keyword in keywords)
 
-def has_java_files(repo_path):
+def has_java_files(repo_path, java_files=None):
     print(f"Verificando arquivos em: {repo_path}")
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            if file.endswith(".java"):
-                print("✅ Arquivo .java encontrado!")
-                return True
+    if java_files is None:
+        java_files = line_counter.find_java_files(repo_path)
+    if java_files:
+        print(f"✅ {len(java_files)} arquivos .java encontrados!")
+        return True
     print("❌ Nenhum arquivo .java encontrado.")
     return False
 
-def processData(repositories):
-    """Processa os dados da API para um DataFrame, excluindo repositórios sem arquivos .java."""
-    repoList = []
-    current_dir = os.path.dirname(__file__)
+def processData(repositories, checkpoint=None, cloneWorkers=CLONE_WORKERS, lineWorkers=LINE_WORKERS, ckWorkers=CK_WORKERS, ckDaemon=False):
+    """
+    Processa os dados da API para um DataFrame, excluindo repositórios sem arquivos .java.
+    Clone, contagem de linhas e CK rodam em pools separados, então um repositório pode estar sendo
+    clonado enquanto outros são analisados. Cada repositório usa sua própria pasta de trabalho.
+    Com um checkpoint, cada repositório concluído é salvo em disco e os já processados são pulados.
+    """
+    scratch_root = os.path.join(os.getcwd(), "Lab02", "src", "repo")
+    maxActive = cloneWorkers + max(lineWorkers, ckWorkers)  # Repositórios clonados em disco ao mesmo tempo
 
     print("🔄 Coletando dados dos repositórios...\n")
 
-    for repo in repositories:
+    jobs = deque()
+    for index, repo in enumerate(repositories):
         node = repo['node']
-        repo_age = calculate_repos_age(node['createdAt'])
+        repo_key = f"{node['owner']['login']}/{node['name']}"
+        if checkpoint and checkpoint.is_done(repo_key):
+            print(f"⏭ Repositório {repo_key} já processado (checkpoint)")
+            continue
 
         repo_name = node['name']
-        if len(repo_name) > 100:  
+        if len(repo_name) > 100:
             print(f"❌ Repositório {repo_name} ignorado (nome muito longo)")
             continue
         clean_name = clean_repo_name(repo_name)
+        scratch_dir = os.path.join(scratch_root, f"{clean_repo_name(node['owner']['login'])}__{clean_name}")
+
+        jobs.append({
+            "index": index,
+            "key": repo_key,
+            "node": node,
+            "url": f"https://github.com/{node['owner']['login']}/{clean_name}.git",
+            "scratch_dir": scratch_dir,
+            "repo_path": os.path.join(scratch_dir, clean_name),
+        })
+
+    results = {}
+    inFlight = {}
+    active = 0
+    # JVMs do CK residentes, uma por execução simultânea do CK
+    ckWorkerPool = quality_metrics_adapter.create_worker_pool(ckWorkers) if ckDaemon and jobs else None
 
-        repo_url = f"https://github.com/{node['owner']['login']}/{clean_name}.git"
-
-        repo_owner = node['owner']['login']  
-        current_dir = os.getcwd()
-        parent_path = os.path.dirname(current_dir)
-        repo_path = os.path.join(current_dir + "\\Lab02\\src\\repo", clean_name)
-
-        clone_repo(repo_path, repo_url)  # Clonando para o caminho certo
-
-        output_path = os.path.join(current_dir  + "\\Lab02\\src\\repo", clean_name)
-        output_path2 = os.path.join(current_dir  + "\\Lab02\\src\\repo")
-
-        if os.path.exists(output_path2) and has_java_files(repo_path):
-            code_lines, comment_lines = count_lines(repo_path)
-            quality_metrics_adapter.run_ck(repo_path, output_path, ck_path)
-            quality_metrics = quality_metrics_adapter.summarize_ck_results(output_path2)
-            remove_repo(output_path2)
-
-            repoList.append({
-                "Nome": node['name'],
-                "Proprietário": node['owner']['login'],
-                "Idade": f"{repo_age} anos",
-                "Estrelas": node['stargazerCount'],
-                "Pull Requests Aceitos": node['pullRequests']['totalCount'],
-                "Releases": node['releases']['totalCount'],
-                "Linhas de código": code_lines,
-                "Linhas de comentário": comment_lines,
-                **quality_metrics
-            })
-        else:
-            print(f"❌ Repositório {node['name']} ignorado (não contém arquivos .java)")
-
-    remove_repo(output_path2)
-
-    return pd.DataFrame(repoList)
+    try:
+        with ThreadPoolExecutor(max_workers=cloneWorkers) as clonePool, \
+                line_counter.create_pool(lineWorkers) as linePool, \
+                ThreadPoolExecutor(max_workers=lineWorkers) as lineDispatchPool, \
+                ThreadPoolExecutor(max_workers=ckWorkers) as ckPool:
+
+            while jobs or inFlight:
+                # Só inicia novos clones enquanto houver espaço, para limitar o uso de disco
+                while jobs and active < maxActive:
+                    job = jobs.popleft()
+                    inFlight[clonePool.submit(cloneStage, job)] = ("clone", job)
+                    active += 1
+
+                done, _ = wait(inFlight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, job = inFlight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"⚠ Erro na etapa '{stage}' do repositório {job['key']}: {e}")
+                        job["failed"] = True
+                        result = None
+
+                    if stage == "clone":
+                        if result:
+                            lineFuture = lineDispatchPool.submit(line_counter.count_lines, job["repo_path"], job["java_files"], linePool)
+                            inFlight[lineFuture] = ("lines", job)
+                            inFlight[ckPool.submit(ckStage, job, ckWorkerPool)] = ("ck", job)
+                            continue
+                        if not job.get("failed"):
+                            print(f"❌ Repositório {job['node']['name']} ignorado (não contém arquivos .java)")
+                            if checkpoint:
+                                checkpoint.save_record(job["key"], None)
+                        remove_repo(job["scratch_dir"])
+                        active -= 1
+                        continue
+
+                    job[stage] = result
+                    if "lines" not in job or "ck" not in job:
+                        continue
+
+                    # Contagem de linhas e CK concluídas: o clone já pode ser apagado
+                    remove_repo(job["scratch_dir"])
+                    active -= 1
+                    if job.get("failed"):
+                        continue
+
+                    node = job["node"]
+                    code_lines, comment_lines = job["lines"]
+                    repo_record = {
+                        "Nome": node['name'],
+                        "Proprietário": node['owner']['login'],
+                        "Data de Criação": node['createdAt'],
+                        "Estrelas": node['stargazerCount'],
+                        "Pull Requests Aceitos": node['pullRequests']['totalCount'],
+                        "Releases": node['releases']['totalCount'],
+                        "Linhas de código": code_lines,
+                        "Linhas de comentário": comment_lines,
+                        **job["ck"]
+                    }
+                    results[job["index"]] = repo_record
+                    if checkpoint:
+                        checkpoint.save_record(job["key"], repo_record)
+    finally:
+        # Encerra as JVMs residentes mesmo se alguma etapa falhar
+        if ckWorkerPool is not None:
+            ckWorkerPool.close()
+
+    if checkpoint:
+        # O checkpoint também contém os repositórios concluídos em execuções anteriores, na ordem em que terminaram;
+        # com as etapas em paralelo essa ordem muda a cada execução, então a tabela segue a ordem da busca
+        positions = {f"{repo['node']['owner']['login']}/{repo['node']['name']}": index for index, repo in enumerate(repositories)}
+        repoList = sorted(checkpoint.records(), key=lambda record: positions.get(f"{record['Proprietário']}/{record['Nome']}", len(positions)))
+    else:
+        repoList = [results[index] for index in sorted(results)]
+    return addAgeColumn(pd.DataFrame(repoList))
+
+def addAgeColumn(df, referenceTime=None):
+    """
+    Converte "Data de Criação" para datetime UTC de uma vez e acrescenta a coluna numérica "Idade" (anos),
+    calculada em relação a um único instante de referência (o fim da coleta, se não informado).
+    """
+    if df.empty:
+        return df
+    referenceTime = referenceTime if referenceTime is not None else pd.Timestamp.now(tz="UTC")
+    df["Data de Criação"] = pd.to_datetime(df["Data de Criação"], utc=True)
+    df.insert(df.columns.get_loc("Data de Criação") + 1, "Idade", calculate_repos_age(df["Data de Criação"], referenceTime))
+    df.attrs["reference_time"] = referenceTime.isoformat()
+    return df
+
+def cloneStage(job):
+    """
+    Clona o repositório na pasta de trabalho do job e indica se há arquivos .java para analisar.
+    Uma falha no clone é propagada para que o repositório não seja salvo no checkpoint como sem arquivos .java.
+    """
+    os.makedirs(job["scratch_dir"], exist_ok=True)
+    job["clone_stats"] = clone_repo(job["repo_path"], job["url"])
+    if job["clone_stats"] is None:
+        raise RuntimeError(f"não foi possível clonar {job['url']}")
+    job["java_files"] = line_counter.find_java_files(job["repo_path"]) if os.path.exists(job["repo_path"]) else []
+    return has_java_files(job["repo_path"], job["java_files"])
+
+def ckStage(job, ckWorkerPool=None):
+    """Roda o CK no clone do job; os CSVs ficam na pasta de trabalho do próprio job."""
+    quality_metrics_adapter.run_ck(job["repo_path"], job["repo_path"], ck_path, ckWorkerPool)
+    return quality_metrics_adapter.summarize_ck_results(job["scratch_dir"])
 
 import re
 def clean_repo_name(repo_name):
@@ -187,33 +297,61 @@ def clean_repo_name(repo_name):
     clean_name = clean_name.strip()  
     return clean_name
 
-def calculate_repos_age(creation_date):
-    repo_age_timezone = datetime.now(timezone.utc) - pd.to_datetime(creation_date)
-    repo_age = repo_age_timezone.days / 325.25
-    return round(float(repo_age), 1)
+def calculate_repos_age(creation_dates, referenceTime):
+    """Idade em anos de uma série de datas de criação já convertidas para datetime UTC."""
+    return ((referenceTime - creation_dates).dt.days / 365.25).round(1)
 
-def clone_repo(clone_path, repo_url):
+def clone_repo(clone_path, repo_url, sparse=True):
+    """
+    Clona o repositório e retorna o modo usado, o tempo gasto e o tamanho em disco da pasta .git.
+    Por padrão faz um clone raso (--depth 1), sem blobs (--filter=blob:none) e com sparse checkout
+    apenas dos arquivos .java; se o servidor ou o git local não suportarem, faz o clone completo.
+    O tamanho em disco aproxima o volume baixado, mas não é o tráfego de rede: os blobs do sparse
+    checkout chegam por buscas sob demanda do git, que não informam progresso.
+    """
     if os.path.exists(clone_path):
         remove_repo(clone_path)
 
-    try:
-        Repo.clone_from(repo_url, clone_path)
-    except Exception as e:
-        print(f"⚠ Erro ao clonar o repositório: {e}")
-
-def count_lines(repo_path):
-    summary = ProjectSummary()
-    for root, _, files in os.walk(repo_path):
+    started = time.perf_counter()
+    mode = None
+
+    if sparse:
+        try:
+            repo = Repo.clone_from(repo_url, clone_path, multi_options=["--depth=1", "--filter=blob:none", "--no-checkout"])
+            repo.git.sparse_checkout("set", "--no-cone", SPARSE_CHECKOUT_PATTERN)
+            repo.git.checkout()
+            mode = "sparse"
+        except Exception as e:
+            print(f"⚠ Clone parcial falhou, tentando clone completo: {e}")
+            if os.path.exists(clone_path):
+                remove_repo(clone_path)
+
+    if mode is None:
+        try:
+            Repo.clone_from(repo_url, clone_path)
+            mode = "full"
+        except Exception as e:
+            print(f"⚠ Erro ao clonar o repositório: {e}")
+            return None
+
+    stats = {
+        "mode": mode,
+        "seconds": round(time.perf_counter() - started, 2),
+        "git_disk_bytes": directory_size(os.path.join(clone_path, ".git")),
+    }
+    print(f"📥 Clone ({stats['mode']}) de {repo_url}: .git com {stats['git_disk_bytes'] / 1024 / 1024:.2f} MB em disco, {stats['seconds']}s")
+    return stats
+
+def directory_size(path):
+    """Soma o tamanho dos arquivos de uma pasta; usado para medir o espaço em disco ocupado pelo .git do clone."""
+    total = 0
+    for root, _, files in os.walk(path):
         for file in files:
-            if file.endswith(".java"):
-                file_path = os.path.join(root, file)
-                analysis = SourceAnalysis.from_file(file_path, "java", encoding="utf-8")
-                summary.add(analysis)
-
-    code_lines = summary.total_code_count
-    comment_lines = summary.total_documentation_count
-
-    return code_lines, comment_lines
+            try:
+                total += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                pass
+    return total
 
 def remove_repo(repo_path):
     """Remove um repositório clonado."""
@@ -227,119 +365,77 @@ def remove_readonly(func, path, _):
     os.chmod(path, stat.S_IWRITE)
     func(path)
 
+# Colunas da tabela do relatório: (coluna do DataFrame, cabeçalho, sufixo do valor)
+REPORT_COLUMNS = [
+    ('Nome', 'Nome', ''),
+    ('Proprietário', 'Proprietário', ''),
+    ('Idade', 'Idade', ' anos'),
+    ('Estrelas', 'Estrelas', ''),
+    ('Pull Requests Aceitos', 'Pull Requests Aceitos', ''),
+    ('Releases', 'Releases', ''),
+    ('Linhas de código', 'Linhas de Código', ''),
+    ('Linhas de comentário', 'Linhas de Comentário', ''),
+    ('Média CBO (Classes)', 'Média CBO (Classes)', ''),
+    ('Média DIT (Classes)', 'Média DIT (Classes)', ''),
+    ('Média LCOM (Classes)', 'Média LCOM (Classes)', ''),
+]
+REPORT_PAGE_SIZE = 100  # Linhas por página da tabela
+REPORT_PAGES_PER_BLOCK = 50  # Páginas renderizadas de uma vez antes de serem gravadas
+REPORT_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "report_template.html")
+
 def plotGraphs(df, output_dir='Lab02/reports'):
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
-    metrics = ['Média CBO (Classes)', 'Média DIT (Classes)', 'Média LCOM (Classes)']
-    graph_paths = []
-
-    fig, axes = plt.subplots(2, len(metrics), figsize=(15, 10))
-    fig.suptitle('Popularidade vs Métricas de Qualidade e Maturidade vs Métricas de Qualidade')
-
-    for i, metric in enumerate(metrics):
-        ax1 = axes[0, i]
-        ax1.scatter(df['Estrelas'], df[metric], color='blue', alpha=0.5)
-        ax1.set_title(f'Popularidade vs {metric}')
-        ax1.set_xlabel('Estrelas')
-        ax1.set_ylabel(metric)
-        ax1.grid(True)
-
-        ax2 = axes[1, i]
-        ax2.scatter(df['Idade'], df[metric], color='green', alpha=0.5)
-        ax2.set_title(f'Maturidade vs {metric}')
-        ax2.set_xlabel('Idade (anos)')
-        ax2.set_ylabel(metric)
-        ax2.grid(True)
-
-    for i in range(len(metrics)):
-        svg_output = io.StringIO()
-        fig.savefig(svg_output, format='svg')
-        svg_output.seek(0)
-
-        svg_content = svg_output.getvalue()
-        encoded_svg = base64.b64encode(svg_content.encode('utf-8')).decode('utf-8')
-        
-        graph_paths.append(f"data:image/svg+xml;base64,{encoded_svg}")
-
-    plt.tight_layout()
-    plt.subplots_adjust(top=0.9)
-    plt.close(fig)
-
-    return graph_paths
-
-def generate_html_report(df, graphs, report_path='Lab02/reports/report.html'):
-    html_content = """
-    <html>
-    <head>
-        <title>Relatório de Repositórios</title>
-        <style>
-            body { font-family: Arial, sans-serif; }
-            h1 { color: #2c3e50; }
-            table { width: 100%; border-collapse: collapse; }
-            th, td { padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }
-            th { background-color: #f2f2f2; }
-            .graph { width: 100%; height: 400px; margin-top: 30px; }
-        </style>
-    </head>
-    <body>
-        <h1>Relatório de Repositórios GitHub</h1>
-        <h2>Dados dos Repositórios</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>Nome</th>
-                    <th>Proprietário</th>
-                    <th>Idade</th>
-                    <th>Estrelas</th>
-                    <th>Pull Requests Aceitos</th>
-                    <th>Releases</th>
-                    <th>Linhas de Código</th>
-                    <th>Linhas de Comentário</th>
-                    <th>Média CBO (Classes)</th>
-                    <th>Média DIT (Classes)</th>
-                    <th>Média LCOM (Classes)</th>
-                </tr>
-            </thead>
-            <tbody>
     """
-    
-    for _, row in df.iterrows():
-        html_content += f"""
-        <tr>
-            <td>{row['Nome']}</td>
-            <td>{row['Proprietário']}</td>
-            <td>{row['Idade']}</td>
-            <td>{row['Estrelas']}</td>
-            <td>{row['Pull Requests Aceitos']}</td>
-            <td>{row['Releases']}</td>
-            <td>{row['Linhas de código']}</td>
-            <td>{row['Linhas de comentário']}</td>
-            <td>{row['Média CBO (Classes)']}</td>
-            <td>{row['Média DIT (Classes)']}</td>
-            <td>{row['Média LCOM (Classes)']}</td>
-        </tr>
-        """
-    
-    html_content += """
-            </tbody>
-        </table>
+    Gera os gráficos do relatório como arquivos SVG em `output_dir`, cada figura gravada uma única vez.
+    Gráficos cujos dados não mudaram desde a última execução são reaproveitados do disco.
+    Retorna os caminhos dos arquivos.
     """
-    
-    html_content += "<h2>Gráficos</h2>"
-    
-    for i, graph in enumerate(graphs):
-        html_content += f"""
-        <div class="graph">
-            <h3>Gráfico {i + 1}</h3>
-            <img src="{graph}" alt="Gráfico {i + 1}">
-        </div>
-        """
-    
-    html_content += """
-    </body>
-    </html>
+    data = df[['Estrelas', 'Idade', *charts.QUALITY_METRICS]]
+    return chart_renderer.render([
+        chart_renderer.chart("qualidade_vs_popularidade_maturidade", charts.drawQualityScatter, data, (15, 10)),
+    ], output_dir=output_dir, fmt='svg', cache=True)
+
+def render_table_rows(df):
+    """Monta as linhas <tr> da tabela de forma vetorizada: cada coluna é escapada e concatenada inteira de uma vez."""
+    row = pd.Series("<tr>", index=df.index)
+    for column, _, suffix in REPORT_COLUMNS:
+        values = df[column].astype(str) if column in df else pd.Series("", index=df.index)
+        escaped = (values.str.replace("&", "&amp;", regex=False)
+                   .str.replace("<", "&lt;", regex=False)
+                   .str.replace(">", "&gt;", regex=False))
+        row = row + "<td>" + escaped + suffix + "</td>"
+    return row + "</tr>"
+
+def generate_html_report(df, graphs, report_path='Lab02/reports/report.html', page_size=REPORT_PAGE_SIZE):
+    """
+    Gera o relatório HTML a partir de report_template.html, escrevendo a tabela no arquivo em blocos.
+    Cada bloco vira uma página (<tbody>) paginada no navegador, e os gráficos são referenciados como
+    arquivos carregados sob demanda em vez de embutidos no HTML.
     """
-    
-    with open(report_path, 'w') as file:
-        file.write(html_content)
+    with open(REPORT_TEMPLATE_PATH, encoding='utf-8') as file:
+        head, tail = file.read().split("$table_pages")
+
+    header_cells = "".join(f"<th>{html.escape(label)}</th>" for _, label, _ in REPORT_COLUMNS)
+    graph_blocks = "\n".join(
+        f'    <div class="graph">\n'
+        f'        <h3>Gráfico {i + 1}</h3>\n'
+        f'        <img src="{html.escape(os.path.relpath(graph, os.path.dirname(report_path)))}" alt="Gráfico {i + 1}" loading="lazy">\n'
+        f'    </div>'
+        for i, graph in enumerate(graphs)
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as file:
+        file.write(Template(head).substitute(total_rows=len(df), header_cells=header_cells))
+        # Renderiza blocos grandes de uma vez e grava cada bloco, já dividido em páginas, antes do próximo
+        block_size = page_size * REPORT_PAGES_PER_BLOCK
+        for block_start in range(0, len(df), block_size):
+            rows = render_table_rows(df.iloc[block_start:block_start + block_size]).tolist()
+            for start in range(0, len(rows), page_size):
+                hidden = " hidden" if block_start or start else ""
+                file.write(f'        <tbody class="page"{hidden}>\n')
+                file.write("\n".join(rows[start:start + page_size]))
+                file.write("\n        </tbody>\n")
+        file.write(Template(tail).substitute(graphs=graph_blocks))
+
+    print(f"📄 Relatório salvo em {report_path}")
+    return report_path
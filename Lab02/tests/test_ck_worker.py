@@ -0,0 +1,127 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.append(SRC)
+sys.path.append(os.path.join(SRC, "..", "..", "shared"))
+import quality_metrics_adapter
+
+CK_JAR = os.path.abspath(os.path.join(SRC, os.path.basename(quality_metrics_adapter.CK_JAR_PATH)))
+
+pytestmark = pytest.mark.skipif(
+    not (shutil.which("java") and shutil.which("javac") and os.path.exists(CK_JAR)),
+    reason="requer java, javac e o jar do CK em Lab02/src",
+)
+
+# Projeto Java pequeno com herança, acoplamento, campos e variáveis locais
+JAVA_SOURCES = {
+    "src/loja/Produto.java": """
+package loja;
+
+public class Produto {
+    protected String nome;
+    protected double preco;
+
+    public Produto(String nome, double preco) {
+        this.nome = nome;
+        this.preco = preco;
+    }
+
+    public double getPreco() {
+        return preco;
+    }
+}
+""",
+    "src/loja/Livro.java": """
+package loja;
+
+import java.util.ArrayList;
+import java.util.List;
+
+public class Livro extends Produto {
+    private final List<String> autores = new ArrayList<>();
+
+    public Livro(String nome, double preco) {
+        super(nome, preco);
+    }
+
+    public void adicionarAutor(String autor) {
+        if (autor != null && !autores.contains(autor)) {
+            autores.add(autor);
+        }
+    }
+
+    public int totalAutores() {
+        return autores.size();
+    }
+}
+""",
+    "src/loja/Carrinho.java": """
+package loja;
+
+import java.util.HashMap;
+import java.util.Map;
+
+public class Carrinho {
+    private final Map<Produto, Integer> itens = new HashMap<>();
+
+    public void adicionar(Produto produto, int quantidade) {
+        itens.merge(produto, quantidade, Integer::sum);
+    }
+
+    public double total() {
+        double soma = 0;
+        for (Map.Entry<Produto, Integer> item : itens.entrySet()) {
+            soma += item.getKey().getPreco() * item.getValue();
+        }
+        return soma;
+    }
+
+    static class Desconto {
+        double aplicar(double valor, double taxa) {
+            return valor * (1 - taxa);
+        }
+    }
+}
+""",
+}
+
+
+@pytest.fixture
+def java_project(tmp_path):
+    project = tmp_path / "projeto"
+    for name, source in JAVA_SOURCES.items():
+        path = project / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    return str(project)
+
+
+def read_csv(path):
+    # A CLI e o worker podem gravar as classes em ordens diferentes; a comparação ignora a ordem das linhas
+    df = pd.read_csv(path)
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def test_worker_matches_java_jar_output(java_project, tmp_path):
+    cli_prefix = str(tmp_path / "cli") + os.sep
+    os.makedirs(cli_prefix)
+    subprocess.run(["java", "-jar", CK_JAR, java_project, "true", "0", "true", cli_prefix], check=True)
+
+    worker_prefixes = [str(tmp_path / f"worker{run}") + os.sep for run in range(2)]
+    with quality_metrics_adapter.CKWorkerPool(1, CK_JAR) as pool:
+        # Duas análises na mesma JVM: a segunda confirma que o worker residente não acumula estado entre jobs
+        for prefix in worker_prefixes:
+            os.makedirs(prefix)
+            assert pool.run(java_project, prefix)
+
+    for prefix in worker_prefixes:
+        for name in ("class.csv", "method.csv", "variable.csv", "field.csv"):
+            pd.testing.assert_frame_equal(read_csv(prefix + name), read_csv(cli_prefix + name))
+        assert quality_metrics_adapter.summarize_ck_results(prefix) == quality_metrics_adapter.summarize_ck_results(cli_prefix)
+    assert len(read_csv(cli_prefix + "class.csv")) == 4
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from git import GitCommandError, Repo
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import repositories_adapter
+
+JAVA_FILES = ["src/Main.java", "src/util/Helper.java"]
+OTHER_FILES = ["README.md", "docs/manual.txt", "build.gradle"]
+
+
+def git(*args, cwd=None):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def bare_repo(tmp_path):
+    """Repositório remoto local (bare) com arquivos Java e outros arquivos, servido via file://."""
+    source = tmp_path / "source"
+    source.mkdir()
+    git("init", "-q", cwd=source)
+    for name in JAVA_FILES + OTHER_FILES:
+        path = source / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"conteúdo de {name}\n")
+    git("add", ".", cwd=source)
+    git("-c", "user.name=teste", "-c", "user.email=teste@exemplo.com", "commit", "-q", "-m", "inicial", cwd=source)
+
+    bare = tmp_path / "remote.git"
+    git("clone", "-q", "--bare", str(source), str(bare))
+    git("config", "uploadpack.allowFilter", "true", cwd=bare)
+    return bare.as_uri()
+
+
+def working_tree_files(path):
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs[:] = [d for d in dirs if d != ".git"]
+        files.extend(os.path.relpath(os.path.join(root, name), path).replace(os.sep, "/") for name in names)
+    return sorted(files)
+
+
+def test_sparse_clone_only_materializes_java_files(bare_repo, tmp_path):
+    clone_path = str(tmp_path / "clone")
+
+    stats = repositories_adapter.clone_repo(clone_path, bare_repo)
+
+    assert stats["mode"] == "sparse"
+    assert stats["git_disk_bytes"] > 0
+    assert working_tree_files(clone_path) == sorted(JAVA_FILES)
+    assert git("rev-parse", "--is-shallow-repository", cwd=clone_path).strip() == "true"
+    assert git("sparse-checkout", "list", cwd=clone_path).split() == [repositories_adapter.SPARSE_CHECKOUT_PATTERN]
+
+    # Os blobs fora do sparse checkout nem chegaram a ser baixados
+    missing = {line[1:] for line in git("rev-list", "--objects", "--missing=print", "HEAD", cwd=clone_path).split() if line.startswith("?")}
+    blobs = {name: git("rev-parse", f"HEAD:{name}", cwd=clone_path).strip() for name in JAVA_FILES + OTHER_FILES}
+    assert {blobs[name] for name in OTHER_FILES} <= missing
+    assert not {blobs[name] for name in JAVA_FILES} & missing
+
+
+def test_falls_back_to_full_clone_when_partial_clone_fails(bare_repo, tmp_path, monkeypatch):
+    class OldGitRepo(Repo):
+        """Simula um git sem suporte a clone parcial: recusa --filter."""
+
+        @classmethod
+        def clone_from(cls, url, to_path, multi_options=None, **kwargs):
+            if multi_options and any(option.startswith("--filter") for option in multi_options):
+                raise GitCommandError(["git", "clone", *multi_options], 129, b"error: unknown option `filter'")
+            return super().clone_from(url, to_path, multi_options=multi_options, **kwargs)
+
+    monkeypatch.setattr(repositories_adapter, "Repo", OldGitRepo)
+    clone_path = str(tmp_path / "clone")
+
+    stats = repositories_adapter.clone_repo(clone_path, bare_repo)
+
+    assert stats["mode"] == "full"
+    assert working_tree_files(clone_path) == sorted(JAVA_FILES + OTHER_FILES)
+    assert git("rev-parse", "--is-shallow-repository", cwd=clone_path).strip() == "false"
+
+
+def test_sparse_disabled_clones_everything(bare_repo, tmp_path):
+    clone_path = str(tmp_path / "clone")
+
+    stats = repositories_adapter.clone_repo(clone_path, bare_repo, sparse=False)
+
+    assert stats["mode"] == "full"
+    assert working_tree_files(clone_path) == sorted(JAVA_FILES + OTHER_FILES)
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+import checkpoint
+import repositories_adapter
+
+
+def repository(name, stars=20000):
+    return {"node": {
+        "name": name, "owner": {"login": "dono"}, "createdAt": "2015-01-01T00:00:00Z", "stargazerCount": stars,
+        "pullRequests": {"totalCount": 0}, "releases": {"totalCount": 0},
+    }}
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Pasta de trabalho temporária: os clones vão para Lab02/src/repo dentro dela."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_failed_clone_is_not_checkpointed(workdir, monkeypatch):
+    # Clone de um endereço inexistente, como uma falha de rede
+    clone_repo = repositories_adapter.clone_repo
+    missing = (workdir / "inexistente.git").as_uri()
+    monkeypatch.setattr(repositories_adapter, "clone_repo", lambda path, url: clone_repo(path, missing))
+    saved = checkpoint.Checkpoint(str(workdir / "checkpoints" / "lab02"))
+
+    df = repositories_adapter.processData([repository("r1")], saved, cloneWorkers=1, lineWorkers=1, ckWorkers=1)
+
+    assert df.empty
+    assert not saved.is_done("dono/r1")
+    assert not checkpoint.Checkpoint(str(workdir / "checkpoints" / "lab02")).is_done("dono/r1")
+
+
+def test_checkpointed_rows_follow_search_order(workdir, monkeypatch):
+    # r3 foi concluído numa execução anterior; nesta, r1 termina depois de r2
+    saved = checkpoint.Checkpoint(str(workdir / "checkpoints" / "lab02"))
+    delays = {"r1": 0.3, "r2": 0.0}
+
+    def clone_stage(job):
+        time.sleep(delays[job["node"]["name"]])
+        job["java_files"] = []
+        return True
+
+    monkeypatch.setattr(repositories_adapter, "cloneStage", clone_stage)
+    monkeypatch.setattr(repositories_adapter, "ckStage", lambda job, ckWorkerPool=None: {"CBO": 1.0})
+    monkeypatch.setattr(repositories_adapter.line_counter, "count_lines", lambda path, java_files, pool: (10, 2))
+    saved.save_record("dono/r3", {
+        "Nome": "r3", "Proprietário": "dono", "Data de Criação": "2015-01-01T00:00:00Z", "Estrelas": 20000,
+        "Pull Requests Aceitos": 0, "Releases": 0, "Linhas de código": 10, "Linhas de comentário": 2, "CBO": 1.0,
+    })
+
+    repositories = [repository("r1"), repository("r2"), repository("r3")]
+    df = repositories_adapter.processData(repositories, saved, cloneWorkers=2, lineWorkers=1, ckWorkers=2)
+
+    assert [record["Nome"] for record in saved.records()] == ["r3", "r2", "r1"]
+    assert list(df["Nome"]) == ["r1", "r2", "r3"]
@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_IN_FLIGHT = 8  # Chamadas GraphQL simultâneas em toda a coleta
+RESULTS_QUEUE_SIZE = 4  # Repositórios concluídos aguardando gravação antes de a coleta pausar
+
+
+class AsyncCrawler:
+    """
+    Motor de coleta com asyncio: vários repositórios são percorridos ao mesmo tempo e todas as chamadas
+    GraphQL passam por um único limite de `max_in_flight` chamadas em andamento. Cada chamada usa a função
+    síncrona `request` (o cliente com pool de conexões e o agendador do orçamento da API) numa thread do
+    executor, então o tempo total passa a depender do orçamento da API e não da latência de cada chamada.
+    """
+
+    def __init__(self, request, max_in_flight=MAX_IN_FLIGHT, results_queue_size=RESULTS_QUEUE_SIZE):
+        self._request = request
+        self.max_in_flight = max_in_flight
+        self.results_queue_size = results_queue_size
+        self._slots = None
+        self._executor = None
+
+    async def request(self, query):
+        """Executa uma consulta respeitando o limite global de chamadas em andamento."""
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._request, query)
+
+    def run(self, items, collect, handle):
+        """
+        Executa a corrotina `collect(crawler, item)` para cada item e entrega cada resultado a `handle(item, resultado)`
+        na ordem em que ficam prontos. Até `max_in_flight` itens são coletados ao mesmo tempo e a fila de resultados
+        é limitada: se `handle` (a gravação) atrasar, novos itens só começam quando houver espaço (backpressure).
+        Uma falha em qualquer coleta ou em `handle` cancela todas as tarefas pendentes antes de ser propagada.
+        """
+        items = list(items)
+        if not items:
+            return
+        try:
+            asyncio.run(self._run(items, collect, handle))
+        except BaseExceptionGroup as group:
+            # Propaga a primeira falha com o tipo original; as demais ficam nas notas e o grupo inteiro na causa
+            errors = _leaf_exceptions(group)
+            for other in errors[1:]:
+                errors[0].add_note(f"Outra falha na mesma coleta: {other!r}")
+            raise errors[0] from group
+
+    async def _run(self, items, collect, handle):
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        results = asyncio.Queue(maxsize=self.results_queue_size)
+        active_items = asyncio.Semaphore(self.max_in_flight)
+        try:
+            async with asyncio.TaskGroup() as tasks:
+                for item in items:
+                    tasks.create_task(self._collect(collect, item, results, active_items))
+                tasks.create_task(self._consume(handle, results, len(items)))
+        finally:
+            # Chamadas já em andamento terminam na sua thread; as que ainda não começaram são descartadas
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _collect(self, collect, item, results, active_items):
+        async with active_items:
+            result = await collect(self, item)
+            # Com a fila cheia o item continua ocupando sua vaga, segurando o início de novas coletas
+            await results.put((item, result))
+
+    @staticmethod
+    async def _consume(handle, results, total):
+        for _ in range(total):
+            item, result = await results.get()
+            handle(item, result)
+
+
+def _leaf_exceptions(group):
+    """Exceções de um grupo, achatando grupos aninhados, na ordem em que aparecem."""
+    errors = []
+    for error in group.exceptions:
+        errors.extend(_leaf_exceptions(error) if isinstance(error, BaseExceptionGroup) else [error])
+    return errors
@@ -0,0 +1,66 @@
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+
+import correlation
+
+
+def spearman_matrix_loop(df):
+    """Implementação anterior: um spearmanr por par de métricas."""
+    metrics = list(df.columns)
+    corr_matrix = pd.DataFrame(index=metrics, columns=metrics)
+    for m1 in metrics:
+        for m2 in metrics:
+            corr, _ = spearmanr(df[m1], df[m2])
+            corr_matrix.loc[m1, m2] = corr
+    return corr_matrix.astype(float)
+
+
+def generate_data(rows, metrics, seed=42):
+    """Métricas sintéticas com muitos empates, como contagens de arquivos e comentários."""
+    rng = np.random.default_rng(seed)
+    base = rng.poisson(5, size=(rows, 1))
+    values = base + rng.poisson(3, size=(rows, metrics))
+    return pd.DataFrame(values, columns=[f"metrica_{i}" for i in range(metrics)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a matriz de Spearman vetorizada com um spearmanr por par.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--metrics', type=int, nargs='+', default=[8, 100])
+    parser.add_argument('--loop-max-cells', type=int, default=10_000_000,
+                        help='Maior linhas x pares em que a implementação anterior ainda é medida')
+    parser.add_argument('--bootstrap', type=int, default=200, help='Reamostragens do bootstrap (0 desativa)')
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    for metrics in args.metrics:
+        for rows in args.rows:
+            data = generate_data(rows, metrics)
+
+            started = time.perf_counter()
+            corr = correlation.spearman_matrix(data)
+            seconds = time.perf_counter() - started
+            line = f"{rows:>10,} PRs x {metrics:>3} métricas: vetorizado {seconds:.2f}s"
+
+            if rows * metrics * metrics <= args.loop_max_cells:
+                started = time.perf_counter()
+                expected = spearman_matrix_loop(data)
+                loop_seconds = time.perf_counter() - started
+                status = "✅" if np.allclose(expected, corr, equal_nan=True) else "❌"
+                line += f" | por par {loop_seconds:.2f}s ({loop_seconds / seconds:.0f}x) {status}"
+
+            if args.bootstrap and metrics <= 8 and rows <= 100_000:
+                started = time.perf_counter()
+                correlation.bootstrap_spearman_ci(data, n_resamples=args.bootstrap, seed=0)
+                line += f" | bootstrap ({args.bootstrap}) {time.perf_counter() - started:.2f}s"
+
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Funções de desenho dos gráficos do Lab03. Cada uma recebe a figura e só os dados de que precisa."""
+import seaborn as sns
+
+
+def desenhar_correlacao(fig, corr_matrix):
+    ax = fig.add_subplot()
+    sns.heatmap(corr_matrix, annot=True, cmap="coolwarm", vmin=-1, vmax=1, ax=ax)
+    ax.set_title("Matriz de Correlação (Spearman) entre Métricas dos Pull Requests")
+
+
+def desenhar_distribuicao(fig, dados):
+    serie, nome_campo, tipo = dados["serie"], dados["nome_campo"], dados["tipo"]
+    ax = fig.add_subplot()
+
+    if tipo == 'histograma':
+        sns.histplot(serie, kde=True, bins=20, color='blue', ax=ax)
+        ax.set_title(f"Distribuição de {nome_campo}")
+        ax.set_xlabel(nome_campo)
+        ax.set_ylabel("Frequência")
+    elif tipo == 'boxplot':
+        sns.boxplot(x=serie, color='green', ax=ax)
+        ax.set_title(f"Boxplot de {nome_campo}")
+        ax.set_xlabel(nome_campo)
+
+
+def desenhar_boxplot_estado(fig, dados):
+    """Boxplot de uma métrica por estado do PR (MERGED ou CLOSED)."""
+    ax = fig.add_subplot()
+    sns.boxplot(x='state', y=dados["coluna"], data=dados["df"], ax=ax)
+    ax.set_title(dados["titulo"])
+    ax.set_xlabel("Status do PR")
+    ax.set_ylabel(dados["rotulo"])
+
+
+def desenhar_dispersao_revisoes(fig, dados):
+    """Dispersão de uma métrica contra o número de revisões."""
+    ax = fig.add_subplot()
+    sns.scatterplot(x=dados["coluna"], y='total_reviews', data=dados["df"], ax=ax)
+    ax.set_title(dados["titulo"])
+    ax.set_xlabel(dados["rotulo"])
+    ax.set_ylabel("Número de Revisões")
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+BOOTSTRAP_BATCH_ELEMENTS = 20_000_000  # Limite de valores (reamostragens x linhas x métricas) por lote do bootstrap
+RANK_BLOCK_COLUMNS = 16  # Colunas ranqueadas por vez, para limitar a memória temporária do rankdata
+
+
+def _as_matrix(df, columns):
+    columns = list(columns) if columns is not None else list(df.columns)
+    return columns, df[columns].to_numpy(dtype=float, copy=True)
+
+
+def _rank_columns(values):
+    """Ranks médios (empates recebem a média) de cada coluna, preenchidos em blocos de colunas."""
+    ranks = np.empty_like(values)
+    for start in range(0, values.shape[1], RANK_BLOCK_COLUMNS):
+        ranks[:, start:start + RANK_BLOCK_COLUMNS] = stats.rankdata(values[:, start:start + RANK_BLOCK_COLUMNS], axis=0)
+    return ranks
+
+
+def _pearson_of_ranks(ranks):
+    """
+    Pearson entre todas as colunas de `ranks` (sem NaN) numa única multiplicação de matrizes.
+    Aceita lotes (..., linhas, colunas). Os ranks são centralizados no próprio array.
+    """
+    ranks -= ranks.mean(axis=-2, keepdims=True)
+    norms = np.sqrt(np.einsum("...ni,...ni->...i", ranks, ranks))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = (ranks.swapaxes(-1, -2) @ ranks) / (norms[..., :, None] * norms[..., None, :])
+    return np.clip(corr, -1.0, 1.0)
+
+
+def spearman_test(df, columns=None, nan_policy="pairwise"):
+    """
+    Matriz de correlação de Spearman entre `columns` com p-valores e número de observações por par.
+    Cada coluna é ranqueada uma vez e a matriz inteira sai de uma multiplicação de matrizes.
+
+    nan_policy:
+      - "pairwise": cada par usa as linhas em que as duas colunas têm valor. Pares envolvendo colunas
+        com NaN são ranqueados de novo só com as linhas válidas, como `spearmanr` faria com o par isolado;
+      - "complete": descarta as linhas com qualquer NaN antes de ranquear.
+    Valores infinitos são tratados como ausentes. Retorna (correlações, p-valores, observações) como DataFrames.
+    """
+    columns, values = _as_matrix(df, columns)
+    values[~np.isfinite(values)] = np.nan
+    missing = np.isnan(values)
+
+    if nan_policy == "complete":
+        values = values[~missing.any(axis=1)]
+        missing = np.zeros_like(values, dtype=bool)
+    elif nan_policy != "pairwise":
+        raise ValueError(f"nan_policy inválida: {nan_policy}")
+
+    complete = ~missing.any(axis=0)
+    n_obs = np.full((len(columns), len(columns)), len(values))
+    corr = np.full((len(columns), len(columns)), np.nan)
+
+    # Colunas sem valores ausentes: um ranking por coluna e uma única multiplicação
+    full = np.flatnonzero(complete)
+    if len(full) and len(values) > 1:
+        corr[np.ix_(full, full)] = _pearson_of_ranks(_rank_columns(values[:, full]))
+
+    # Pares com alguma coluna incompleta: ranqueia apenas as linhas válidas do par
+    for i in np.flatnonzero(~complete):
+        for j in range(len(columns)):
+            valid = ~(missing[:, i] | missing[:, j])
+            n_obs[i, j] = n_obs[j, i] = valid.sum()
+            if n_obs[i, j] > 1:
+                pair = stats.rankdata(values[valid][:, [i, j]], axis=0)
+                corr[i, j] = corr[j, i] = _pearson_of_ranks(pair)[0, 1]
+
+    pvalues = spearman_pvalues(corr, n_obs)
+    return (
+        pd.DataFrame(corr, index=columns, columns=columns),
+        pd.DataFrame(pvalues, index=columns, columns=columns),
+        pd.DataFrame(n_obs, index=columns, columns=columns),
+    )
+
+
+def spearman_matrix(df, columns=None, nan_policy="pairwise"):
+    return spearman_test(df, columns, nan_policy)[0]
+
+
+def spearman_pvalues(corr, n_obs):
+    """P-valor bilateral pela aproximação t de Student com n - 2 graus de liberdade (a mesma do `spearmanr`)."""
+    corr = np.asarray(corr, dtype=float)
+    dof = np.asarray(n_obs, dtype=float) - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = corr * np.sqrt(dof / ((1.0 - corr) * (1.0 + corr)))
+        pvalues = 2 * stats.t.sf(np.abs(t), dof)
+    pvalues[dof <= 0] = np.nan
+    return pvalues
+
+
+def bootstrap_spearman_ci(df, columns=None, n_resamples=1000, confidence=0.95, seed=None,
+                          batch_elements=BOOTSTRAP_BATCH_ELEMENTS):
+    """
+    Intervalos de confiança (percentil) da matriz de Spearman por bootstrap. As reamostragens são
+    processadas em lotes: cada lote ranqueia e correlaciona todas as reamostragens de uma vez, com o
+    tamanho limitado por `batch_elements` para caber na memória. Usa as linhas sem valores ausentes.
+    Retorna (limite inferior, limite superior) como DataFrames.
+    """
+    columns, values = _as_matrix(df, columns)
+    values = values[np.isfinite(values).all(axis=1)]
+    n_rows, n_columns = values.shape
+    rng = np.random.default_rng(seed)
+
+    # Cada valor vira a posição dele entre os valores distintos da coluna; o rank numa reamostragem sai
+    # de uma contagem (bincount) dessas posições, sem ordenar a reamostragem de novo
+    codes = np.empty(values.shape, dtype=np.int64)
+    n_distinct = []
+    for column in range(n_columns):
+        distinct, codes[:, column] = np.unique(values[:, column], return_inverse=True)
+        n_distinct.append(len(distinct))
+
+    batch_size = max(1, batch_elements // max(1, n_rows * n_columns))
+    samples = np.empty((n_resamples, n_columns, n_columns))
+    for start in range(0, n_resamples, batch_size):
+        size = min(batch_size, n_resamples - start)
+        indices = rng.integers(0, n_rows, size=(size, n_rows))
+        ranks = np.empty((size, n_rows, n_columns))
+        for column in range(n_columns):
+            ranks[:, :, column] = _resample_ranks(codes[indices, column], n_distinct[column])
+        samples[start:start + size] = _pearson_of_ranks(ranks)
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.nanquantile(samples, [alpha, 1 - alpha], axis=0)
+    return (
+        pd.DataFrame(lower, index=columns, columns=columns),
+        pd.DataFrame(upper, index=columns, columns=columns),
+    )
+
+
+def _resample_ranks(codes, n_distinct):
+    """Ranks médios de cada linha de `codes` (reamostragens x linhas) a partir da contagem de cada valor distinto."""
+    size = codes.shape[0]
+    offsets = np.arange(size)[:, None] * n_distinct
+    counts = np.bincount((codes + offsets).ravel(), minlength=size * n_distinct).reshape(size, n_distinct)
+    below = np.cumsum(counts, axis=1) - counts
+    rank_of_value = below + (counts + 1) / 2
+    return np.take_along_axis(rank_of_value, codes, axis=1)
+
+
+def summarize_pairs(df, pairs):
+    """
+    Correlação de Spearman, p-valor e média/mediana de x e de y para cada par (x, y) de colunas de `df`,
+    tudo a partir de uma única matriz de Spearman e de uma passada de média/mediana por coluna.
+    Como no cálculo par a par, cada par usa só as linhas em que x e y são finitos.
+    Retorna um DataFrame com uma linha por par.
+    """
+    columns = list(dict.fromkeys(column for pair in pairs for column in pair))
+    corr, pvalues, n_obs = spearman_test(df, columns)
+
+    values = df[columns].astype(float).replace([np.inf, -np.inf], np.nan)
+    valid = values.notna()
+    means = values.mean()
+    medians = values.median()
+
+    rows = []
+    for x, y in pairs:
+        mask = valid[x] & valid[y]
+        if mask.all():
+            mean_x, median_x, mean_y, median_y = means[x], medians[x], means[y], medians[y]
+        else:
+            # Só pares com valores ausentes precisam das estatísticas restritas às linhas válidas
+            subset = values.loc[mask, [x, y]]
+            mean_x, median_x = subset[x].mean(), subset[x].median()
+            mean_y, median_y = subset[y].mean(), subset[y].median()
+        rows.append({
+            "x": x, "y": y, "n": n_obs.loc[x, y],
+            "correlacao": corr.loc[x, y], "p_valor": pvalues.loc[x, y],
+            "media_x": mean_x, "mediana_x": median_x, "media_y": mean_y, "mediana_y": median_y,
+        })
+    return pd.DataFrame(rows)
@@ -1,49 +1,61 @@
-import repositories_adapter
+import argparse
+import os
+import sys
+
+import async_crawler
+import correlation
+import pr_store
 import pandas as pd
-from scipy.stats import spearmanr
 
-def calcular_correlacoes_rqs(df):
-    """
-    Calcula a correlação de Spearman entre as métricas dos RQs e o feedback final ou número de revisões,
-    e também calcula média e mediana dos valores.
-    """
-    rqs = {
-        # A. Feedback Final das Revisões (Status do PR)
-        "RQ 01 - Relação entre o tamanho dos PRs e o feedback final das revisões": (df['total_additions'] + df['total_deletions'], df['feedback_score']),
-        "RQ 02 - Relação entre o tempo de análise dos PRs e o feedback final das revisões": (df['analysis_time_hours'], df['feedback_score']),
-        "RQ 03 - Relação entre a descrição dos PRs e o feedback final das revisões": (df['description_length'], df['feedback_score']),
-        "RQ 04 - Relação entre as interações nos PRs e o feedback final das revisões": (df['total_comments'] + df['total_participants'], df['feedback_score']),
-
-        # B. Número de Revisões
-        "RQ 05 - Relação entre o tamanho dos PRs e o número de revisões realizadas": (df['total_additions'] + df['total_deletions'], df['total_reviews']),
-        "RQ 06 - Relação entre o tempo de análise dos PRs e o número de revisões realizadas": (df['analysis_time_hours'], df['total_reviews']),
-        "RQ 07 - Relação entre a descrição dos PRs e o número de revisões realizadas": (df['description_length'], df['total_reviews']),
-        "RQ 08 - Relação entre as interações nos PRs e o número de revisões realizadas": (df['total_comments'] + df['total_participants'], df['total_reviews']),
-    }
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+import chart_renderer
+import checkpoint
 
-    resultados = {}
+# Progresso e PRs salvos em disco; use --reset-checkpoint para recomeçar a coleta do zero
+CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checkpoints", "lab03")
+PR_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checkpoints", "lab03_prs")
 
-    for nome_rq, (x, y) in rqs.items():
-        # Remover valores nulos ou infinitos
-        dados_validos = pd.DataFrame({'x': x, 'y': y}).replace([float('inf'), -float('inf')], pd.NA).dropna()
+# Colunas dos PRs lidas do armazenamento para as RQs e a estratificação
+COLUNAS_RQS = [
+    "total_additions", "total_deletions", "total_comments", "total_participants",
+    "analysis_time_hours", "description_length", "feedback_score", "total_reviews",
+    "repo_owner", "repo_name",
+]
 
-        if not dados_validos.empty:
-            correlacao, p_valor = spearmanr(dados_validos['x'], dados_validos['y'])
+# RQs: (nome, métrica x, métrica y). As métricas derivadas vêm de `calcular_metricas_derivadas`
+RQS = [
+    # A. Feedback Final das Revisões (Status do PR)
+    ("RQ 01 - Relação entre o tamanho dos PRs e o feedback final das revisões", "tamanho", "feedback_score"),
+    ("RQ 02 - Relação entre o tempo de análise dos PRs e o feedback final das revisões", "analysis_time_hours", "feedback_score"),
+    ("RQ 03 - Relação entre a descrição dos PRs e o feedback final das revisões", "description_length", "feedback_score"),
+    ("RQ 04 - Relação entre as interações nos PRs e o feedback final das revisões", "interacoes", "feedback_score"),
 
-            media_x = round(dados_validos['x'].mean(), 2)
-            mediana_x = round(dados_validos['x'].median(), 2)
-            media_y = round(dados_validos['y'].mean(), 2)
-            mediana_y = round(dados_validos['y'].median(), 2)
+    # B. Número de Revisões
+    ("RQ 05 - Relação entre o tamanho dos PRs e o número de revisões realizadas", "tamanho", "total_reviews"),
+    ("RQ 06 - Relação entre o tempo de análise dos PRs e o número de revisões realizadas", "analysis_time_hours", "total_reviews"),
+    ("RQ 07 - Relação entre a descrição dos PRs e o número de revisões realizadas", "description_length", "total_reviews"),
+    ("RQ 08 - Relação entre as interações nos PRs e o número de revisões realizadas", "interacoes", "total_reviews"),
+]
 
-            resultados[nome_rq] = {
-                "Correlação (Spearman)": round(correlacao, 3) if pd.notna(correlacao) else None,
-                "p-valor": round(p_valor, 5) if pd.notna(p_valor) else None,
-                "Média (x)": media_x,
-                "Mediana (x)": mediana_x,
-                "Média (y)": media_y,
-                "Mediana (y)": mediana_y
-            }
-        else:
+
+def calcular_metricas_derivadas(df):
+    """Calcula uma única vez as métricas usadas pelas RQs, incluindo tamanho e interações."""
+    return pd.DataFrame({
+        "tamanho": df['total_additions'] + df['total_deletions'],
+        "interacoes": df['total_comments'] + df['total_participants'],
+        "analysis_time_hours": df['analysis_time_hours'],
+        "description_length": df['description_length'],
+        "feedback_score": df['feedback_score'],
+        "total_reviews": df['total_reviews'],
+    })
+
+
+def _resultados_rqs(metricas):
+    resumo = correlation.summarize_pairs(metricas, [(x, y) for _, x, y in RQS])
+
+    resultados = {}
+    for (nome_rq, _, _), linha in zip(RQS, resumo.itertuples()):
+        if linha.n == 0:
             resultados[nome_rq] = {
                 "Correlação (Spearman)": None,
                 "p-valor": None,
@@ -52,33 +64,103 @@ def calcular_correlacoes_rqs(df):
                 "Média (y)": None,
                 "Mediana (y)": None
             }
+            continue
 
+        resultados[nome_rq] = {
+            "Correlação (Spearman)": round(linha.correlacao, 3) if pd.notna(linha.correlacao) else None,
+            "p-valor": round(linha.p_valor, 5) if pd.notna(linha.p_valor) else None,
+            "Média (x)": round(linha.media_x, 2),
+            "Mediana (x)": round(linha.mediana_x, 2),
+            "Média (y)": round(linha.media_y, 2),
+            "Mediana (y)": round(linha.mediana_y, 2)
+        }
     return resultados
 
+
+def calcular_correlacoes_rqs(df, estratos=None):
+    """
+    Calcula a correlação de Spearman entre as métricas dos RQs e o feedback final ou número de revisões,
+    e também calcula média e mediana dos valores. Todas as RQs saem de um único cálculo em lote.
+    Com `estratos` (uma série alinhada a `df`, como repositório ou linguagem), retorna um dicionário
+    {estrato: resultados} reaproveitando as métricas derivadas já calculadas.
+    """
+    metricas = calcular_metricas_derivadas(df)
+    if estratos is None:
+        return _resultados_rqs(metricas)
+
+    estratos = pd.Series(estratos, index=df.index)
+    grupos = estratos.groupby(estratos, observed=True, sort=True).indices
+    return {estrato: _resultados_rqs(metricas.iloc[posicoes]) for estrato, posicoes in grupos.items()}
+
+
+def exibir_resultados_rqs(resultados):
+    for campo, valores in resultados.items():
+        print(f"\n{campo}:")
+        print(f" - Correlação: {valores['Correlação (Spearman)']}")
+        print(f" - p-valor: {valores['p-valor']}")
+        print(f" - Média (x): {valores['Média (x)']} | Mediana (x): {valores['Mediana (x)']}")
+        print(f" - Média (y): {valores['Média (y)']} | Mediana (y): {valores['Mediana (y)']}")
+
+
+def estratos_prs(df, df_prs, criterio):
+    """Série alinhada aos PRs com o repositório ou a linguagem principal do repositório de cada PR."""
+    repositorios = df_prs['repo_owner'].astype(str) + "/" + df_prs['repo_name'].astype(str)
+    if criterio == 'repositorio':
+        return repositorios
+    linguagens = pd.Series(df['Linguagem Principal'].to_numpy(), index=df['Proprietário'] + "/" + df['Nome'])
+    return repositorios.map(linguagens)
+
+
 # Código principal
-repositories = repositories_adapter.fetch_repositories()
-
-if repositories:
-    df = repositories_adapter.process_data(repositories)
-    if df is not None:
-        print(df.to_string())
-
-        # Coletar dados dos PRs
-        pr_dados = []
-        for repo in repositories:
-            pr_dados.extend(repositories_adapter.collect_repository_metrics(repo))
-
-        if pr_dados:
-            df_prs = pd.DataFrame(pr_dados)
-
-            # Calcular e mostrar resultados
-            resultados = calcular_correlacoes_rqs(df_prs)
-            print("\n📊 Resultados (Correlação de Spearman, Média e Mediana):")
-            for campo, valores in resultados.items():
-                print(f"\n{campo}:")
-                print(f" - Correlação: {valores['Correlação (Spearman)']}")
-                print(f" - p-valor: {valores['p-valor']}")
-                print(f" - Média (x): {valores['Média (x)']} | Mediana (x): {valores['Mediana (x)']}")
-                print(f" - Média (y): {valores['Média (y)']} | Mediana (y): {valores['Mediana (y)']}")
-        else:
-            print("⚠️ Nenhum dado de Pull Request coletado.")
+def main():
+    # Importado aqui: os processos dos gráficos (spawn) reimportam este módulo e não devem criar o cliente da API
+    import repositories_adapter
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--charts-dir', help='Gravar os gráficos nesta pasta (sem janelas) em vez de exibi-los')
+    parser.add_argument('--charts-format', choices=['png', 'svg'], default='png', help='Formato dos gráficos gravados')
+    parser.add_argument('--chart-workers', type=int, help='Processos usados para gerar os gráficos')
+    parser.add_argument('--max-in-flight', type=int, default=async_crawler.MAX_IN_FLIGHT,
+                        help='Chamadas à API em andamento ao mesmo tempo na coleta dos PRs (1 coleta um repositório por vez)')
+    parser.add_argument('--pr-discovery', choices=['search', 'list'], default=repositories_adapter.PR_DISCOVERY,
+                        help='Encontrar os PRs revisados pela API de busca (search) ou listando todos os PRs (list)')
+    parser.add_argument('--estratificar', choices=['repositorio', 'linguagem'], help='Repetir as RQs para cada repositório ou linguagem')
+    parser.add_argument('--reset-checkpoint', action='store_true', help='Ignorar o progresso e os PRs salvos e recomeçar a coleta')
+    args = parser.parse_args()
+    chart_renderer.configure(args.charts_dir, args.charts_format, args.chart_workers)
+
+    collection_checkpoint = checkpoint.Checkpoint(CHECKPOINT_PATH)
+    if args.reset_checkpoint:
+        # Os PRs gravados pertencem aos repositórios do checkpoint e são descartados junto com ele
+        collection_checkpoint.clear()
+        pr_store.PRStore(PR_STORE_PATH).clear()
+    repositories = repositories_adapter.fetch_repositories(checkpoint=collection_checkpoint)
+
+    if repositories:
+        # Os PRs de cada repositório são coletados uma única vez e reaproveitados pelas RQs
+        store = pr_store.PRStore(PR_STORE_PATH)
+        df, store = repositories_adapter.process_data(repositories, checkpoint=collection_checkpoint, store=store,
+                                                       max_in_flight=args.max_in_flight, discovery=args.pr_discovery)
+        if df is not None:
+            print(df.to_string())
+
+            df_prs = store.read(columns=COLUNAS_RQS)
+            if not df_prs.empty:
+                # Calcular e mostrar resultados
+                resultados = calcular_correlacoes_rqs(df_prs)
+                print("\n📊 Resultados (Correlação de Spearman, Média e Mediana):")
+                exibir_resultados_rqs(resultados)
+
+                if args.estratificar:
+                    por_estrato = calcular_correlacoes_rqs(df_prs, estratos_prs(df, df_prs, args.estratificar))
+                    for estrato, resultados_estrato in por_estrato.items():
+                        print(f"\n📊 Resultados para {args.estratificar} {estrato}:")
+                        exibir_resultados_rqs(resultados_estrato)
+            else:
+                print("⚠️ Nenhum dado de Pull Request coletado.")
+
+    chart_renderer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
+from typing import NamedTuple
+
+import numpy as np
+import pyarrow as pa
+
+from pr_store import PR_SCHEMA
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+MICROSECONDS_PER_HOUR = 3_600_000_000
+
+
+class PRState(IntEnum):
+    OPEN = 0
+    CLOSED = 1
+    MERGED = 2
+
+
+STATE_NAMES = [state.name for state in PRState]
+
+
+class PRRecord(NamedTuple):
+    """Métricas de uma PR: só inteiros, com o repositório como id do `RepoRegistry` e datas em microssegundos UTC."""
+    repo_id: int
+    pr_number: int
+    state: PRState
+    created_at: int
+    closed_at: int
+    total_files: int
+    total_additions: int
+    total_deletions: int
+    description_length: int
+    total_comments: int
+    total_participants: int
+    total_reviews: int
+    feedback_score: int
+
+
+# Tipo de cada coluna no construtor: ids e estado em inteiros pequenos, o resto em 64 bits
+TYPECODES = {"repo_id": "i", "state": "b"}
+
+
+def to_microseconds(timestamp):
+    """Data ISO da API (ex.: 2024-01-31T12:00:00Z) em microssegundos desde 1970, UTC."""
+    return (datetime.fromisoformat(timestamp) - EPOCH) // MICROSECOND
+
+
+class RepoRegistry:
+    """Ids inteiros para repositórios: proprietário e nome são internados e guardados uma única vez."""
+
+    def __init__(self):
+        self._ids = {}
+        self.owners = []
+        self.names = []
+
+    def repo_id(self, owner, name):
+        repo_id = self._ids.get((owner, name))
+        if repo_id is None:
+            repo_id = self._ids[(owner, name)] = len(self.owners)
+            self.owners.append(sys.intern(owner))
+            self.names.append(sys.intern(name))
+        return repo_id
+
+
+class PRColumns:
+    """
+    Construtor struct-of-arrays de `PRRecord`: cada campo é um `array.array` tipado, sem um objeto por PR.
+    `to_numpy` expõe as colunas sem cópia; enquanto essas visões existirem o construtor não aceita novas PRs.
+    """
+
+    def __init__(self, records=()):
+        self._columns = {field: array(TYPECODES.get(field, "q")) for field in PRRecord._fields}
+        for record in records:
+            self.append(record)
+
+    def append(self, record):
+        for column, value in zip(self._columns.values(), record):
+            column.append(value)
+
+    def __len__(self):
+        return len(self._columns["pr_number"])
+
+    def to_numpy(self):
+        return {
+            field: np.frombuffer(column, dtype=np.dtype(column.typecode))
+            for field, column in self._columns.items()
+        }
+
+    def to_arrow(self, registry):
+        """
+        Tabela Arrow no `PR_SCHEMA` do armazenamento de PRs, com `analysis_time_hours` calculado.
+        As colunas numéricas reaproveitam os buffers do construtor; estado e repositório viram dictionary.
+        """
+        columns = self.to_numpy()
+        repo_ids = columns["repo_id"]
+        table = pa.table({
+            "pr_number": columns["pr_number"],
+            "state": _dictionary(STATE_NAMES, columns["state"]),
+            "created_at": pa.array(columns["created_at"], type=pa.timestamp("us", tz="UTC")),
+            "closed_at": pa.array(columns["closed_at"], type=pa.timestamp("us", tz="UTC")),
+            "analysis_time_hours": (columns["closed_at"] - columns["created_at"]) / MICROSECONDS_PER_HOUR,
+            "total_files": columns["total_files"],
+            "total_additions": columns["total_additions"],
+            "total_deletions": columns["total_deletions"],
+            "description_length": columns["description_length"],
+            "total_comments": columns["total_comments"],
+            "total_participants": columns["total_participants"],
+            "total_reviews": columns["total_reviews"],
+            "feedback_score": columns["feedback_score"],
+            "repo_owner": _dictionary(registry.owners, repo_ids),
+            "repo_name": _dictionary(registry.names, repo_ids),
+        })
+        return table.cast(PR_SCHEMA)
+
+
+def _dictionary(values, ids):
+    # Só os valores presentes entram no dicionário (categorias sem PRs não aparecem nos gráficos)
+    return pa.array(values, type=pa.string()).take(pa.array(ids)).dictionary_encode()
@@ -0,0 +1,77 @@
+import os
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checkpoints", "lab03_prs")
+
+# Tipos das colunas gravadas; estado e identificadores do repositório usam dictionary encoding
+PR_SCHEMA = pa.schema([
+    ("pr_number", pa.int64()),
+    ("state", pa.dictionary(pa.int8(), pa.string())),
+    ("created_at", pa.timestamp("us", tz="UTC")),
+    ("closed_at", pa.timestamp("us", tz="UTC")),
+    ("analysis_time_hours", pa.float64()),
+    ("total_files", pa.int64()),
+    ("total_additions", pa.int64()),
+    ("total_deletions", pa.int64()),
+    ("description_length", pa.int64()),
+    ("total_comments", pa.int64()),
+    ("total_participants", pa.int64()),
+    ("total_reviews", pa.int64()),
+    ("feedback_score", pa.int64()),
+    ("repo_owner", pa.dictionary(pa.int32(), pa.string())),
+    ("repo_name", pa.dictionary(pa.int32(), pa.string())),
+])
+
+
+class PRStore:
+    """
+    Conjunto de PRs em Parquet gravado durante a coleta: as PRs de cada repositório vão para uma parte
+    própria, `part-<repositório>.parquet` (gravada num temporário e renomeada). Gravar de novo o mesmo
+    repositório substitui a parte, então repetir um repositório após uma interrupção não duplica PRs.
+    A análise lê só as colunas de que precisa.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = os.path.abspath(path)
+        os.makedirs(self.path, exist_ok=True)
+
+    def write(self, repo_key, table):
+        """Grava (ou substitui) as PRs do repositório `repo_key`, uma tabela Arrow no `PR_SCHEMA`."""
+        path = self.part_path(repo_key)
+        if table is None or not table.num_rows:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+
+        tmp_path = os.path.join(self.path, f".{os.path.basename(path)}.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+
+    def part_path(self, repo_key):
+        return os.path.join(self.path, f"part-{quote(repo_key, safe='')}.parquet")
+
+    def parts(self):
+        return sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.startswith("part-") and name.endswith(".parquet")
+        )
+
+    def dataset(self):
+        return ds.dataset(self.parts(), schema=PR_SCHEMA, format="parquet")
+
+    def count_rows(self):
+        return self.dataset().count_rows() if self.parts() else 0
+
+    def read(self, columns=None):
+        """Lê as PRs gravadas como DataFrame, apenas com `columns` (todas, se não informado)."""
+        if not self.parts():
+            return PR_SCHEMA.empty_table().select(columns or PR_SCHEMA.names).to_pandas()
+        return self.dataset().to_table(columns=columns).to_pandas()
+
+    def clear(self):
+        for path in self.parts():
+            os.remove(path)
@@ -1,14 +1,23 @@
-import datetime
+import asyncio
 import json
+import math
 import os
+import sys
 import time
 
 import pandas as pd
-import requests
-import seaborn as sns
-import matplotlib.pyplot as plt
+import pyarrow.compute as pc
 from dotenv import load_dotenv
-from scipy.stats import spearmanr
+
+import async_crawler
+import charts
+import correlation
+import pr_records
+import pr_store
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+import chart_renderer
+import github_client
 
 load_dotenv()
 token = os.getenv("GITHUB_TOKEN")
@@ -16,17 +25,13 @@ token = os.getenv("GITHUB_TOKEN")
 if not token:
     raise ValueError("Erro: O token do GitHub não foi encontrado. Verifique o arquivo .env.")
 
-headers = {
-    "Authorization": f"Bearer {token}",
-    "Content-Type": "application/json"
-}
-
-GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+client = github_client.GitHubClient(token)
+REPOSITORIES = pr_records.RepoRegistry()  # Ids internados dos repositórios coletados
 
 def make_github_request(query, max_retries=5):
     retries = 0
     while retries < max_retries:
-        response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query}, headers=headers)
+        response = client.post(query)
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 502:
@@ -39,12 +44,13 @@ def make_github_request(query, max_retries=5):
             break
     return None
 
-def fetch_repositories(total_repos=200, batch_size=1):
-    all_repos = []
-    cursor = None
+def fetch_repositories(total_repos=200, batch_size=1, checkpoint=None):
+    all_repos = checkpoint.get_state("repositories", []) if checkpoint else []
+    cursor = checkpoint.get_state("cursor") if checkpoint else None
+    first_batch = checkpoint.get_state("batches_done", 0) if checkpoint else 0
     num_batches = total_repos // batch_size
 
-    for batch in range(num_batches):
+    for batch in range(first_batch, num_batches):
         print(f"🔄 Buscando repositórios... (Chamada {batch + 1}/{num_batches})")
         query = f"""
         {{
@@ -77,25 +83,48 @@ def fetch_repositories(total_repos=200, batch_size=1):
             all_repos.extend(repositories)
             page_info = data['data']['search']['pageInfo']
             cursor = page_info["endCursor"] if page_info["hasNextPage"] else None
+            if checkpoint:
+                checkpoint.update_state(cursor=cursor, repositories=all_repos, batches_done=batch + 1)
         else:
             print("❌ Erro ao buscar repositórios, encerrando a busca.")
             break
 
     return all_repos
 
-def fetch_pull_requests(repository, max_pages=3):
-    repo_name = repository['node']['name']
-    owner = repository['node']['owner']['login']
-    cursor = None
-    reviewed_prs = []
-    page_count = 0
-
-    while page_count < max_pages:
-        print(f"🔍 Buscando PRs revisados para {owner}/{repo_name} (Página {page_count + 1})")
-        query = f"""
+# Descoberta dos PRs revisados de cada repositório:
+#   "search": a API de busca devolve só PRs fechados/mergeados que receberam revisão, mais o total deles;
+#   "list": lista todos os PRs fechados/mergeados (até `max_pages` páginas) e descarta os sem revisão no cliente.
+PR_DISCOVERY = "search"
+PR_SEARCH_QUALIFIERS = "is:pr is:closed -review:none sort:created-asc"
+
+def pull_requests_query(owner, repo_name, cursor=None, discovery=PR_DISCOVERY):
+    after = json.dumps(cursor) if cursor else "null"
+    if discovery == "search":
+        search_query = json.dumps(f"repo:{owner}/{repo_name} {PR_SEARCH_QUALIFIERS}")
+        return f"""
+        {{
+          search(query: {search_query}, type: ISSUE, first: 100, after: {after}) {{
+            issueCount
+            nodes {{
+              ... on PullRequest {{
+                number
+                title
+                reviews(first: 1) {{
+                  totalCount
+                }}
+              }}
+            }}
+            pageInfo {{
+              hasNextPage
+              endCursor
+            }}
+          }}
+        }}
+        """
+    return f"""
         {{
           repository(owner: "{owner}", name: "{repo_name}") {{
-            pullRequests(states: [MERGED, CLOSED], first: 100, after: {json.dumps(cursor) if cursor else "null"}) {{
+            pullRequests(states: [MERGED, CLOSED], first: 100, after: {after}) {{
               nodes {{
                 number
                 title
@@ -112,73 +141,154 @@ def fetch_pull_requests(repository, max_pages=3):
         }}
         """
 
-        data = make_github_request(query)
+def parse_pull_requests_page(data, discovery=PR_DISCOVERY):
+    """
+    PRs revisados de uma página, o cursor da próxima página e o total de PRs revisados do repositório
+    (informado pela busca; None na listagem). Retorna None se a resposta veio com erro.
+    """
+    if discovery == "search":
+        if not (data and data.get("data") and data["data"].get("search")):
+            return None
+        connection = data["data"]["search"]
+        total = connection["issueCount"]
+    else:
+        if not (data and "data" in data and data["data"].get("repository")):
+            return None
+        connection = data['data']['repository']['pullRequests']
+        total = None
+
+    # A busca já filtra as revisões; a verificação continua valendo como garantia
+    reviewed_prs = [
+        {"number": pr['number'], "title": pr['title']}
+        for pr in connection['nodes']
+        if pr and pr['reviews']['totalCount'] > 0
+    ]
+    page_info = connection['pageInfo']
+    return reviewed_prs, page_info["endCursor"] if page_info["hasNextPage"] else None, total
 
-        if data and "data" in data and data["data"].get("repository"):
-            prs = data['data']['repository']['pullRequests']['nodes']
-            reviewed_prs.extend([
-                {"number": pr['number'], "title": pr['title']}
-                for pr in prs
-                if pr['reviews']['totalCount'] > 0
-            ])
+def _enough_pull_requests(reviewed_prs, total, max_prs):
+    # Com o total vindo da busca, basta juntar a amostra de `max_prs` PRs; a listagem percorre todas as páginas
+    return total is not None and max_prs is not None and len(reviewed_prs) >= max_prs
 
-            page_info = data['data']['repository']['pullRequests']['pageInfo']
-            cursor = page_info["endCursor"] if page_info["hasNextPage"] else None
-            if not cursor:
-                break
-        else:
+def pull_requests_pages(repository, max_pages=3, max_prs=None, discovery=PR_DISCOVERY):
+    """
+    Paginação da descoberta de PRs revisados, sem fazer as chamadas: gera a consulta de cada página e recebe
+    a resposta por `send()`. Usada tanto pela coleta síncrona quanto pelo `AsyncCrawler`.
+    Ao terminar, retorna os PRs revisados (até `max_prs` na busca), o total de PRs revisados e se alguma
+    página falhou (nesse caso a lista está incompleta).
+    """
+    repo_name = repository['node']['name']
+    owner = repository['node']['owner']['login']
+    cursor = None
+    reviewed_prs = []
+    total = None
+    failed = False
+
+    for page_count in range(max_pages):
+        print(f"🔍 Buscando PRs revisados para {owner}/{repo_name} (Página {page_count + 1})")
+        data = yield pull_requests_query(owner, repo_name, cursor, discovery)
+        page = parse_pull_requests_page(data, discovery)
+        if page is None:
             print(f"⚠️ Erro ao buscar PRs para {owner}/{repo_name}.")
+            failed = True
+            break
+
+        prs, cursor, total = page
+        reviewed_prs.extend(prs)
+        if not cursor or _enough_pull_requests(reviewed_prs, total, max_prs):
             break
 
-        page_count += 1
+    return reviewed_prs, total if total is not None else len(reviewed_prs), failed
 
-    return reviewed_prs
+def fetch_pull_requests(repository, max_pages=3, max_prs=None, discovery=PR_DISCOVERY):
+    """
+    Retorna os PRs revisados do repositório (até `max_prs` na busca), o total de PRs revisados e se
+    alguma página da descoberta falhou.
+    """
+    pages = pull_requests_pages(repository, max_pages, max_prs, discovery)
+    try:
+        query = next(pages)
+        while True:
+            query = pages.send(make_github_request(query))
+    except StopIteration as finished:
+        return finished.value
+
+async def fetch_pull_requests_async(crawler, repository, max_pages=3, max_prs=None, discovery=PR_DISCOVERY):
+    """Versão de `fetch_pull_requests` para o `AsyncCrawler`; as páginas dependem do cursor e seguem em sequência."""
+    pages = pull_requests_pages(repository, max_pages, max_prs, discovery)
+    try:
+        query = next(pages)
+        while True:
+            query = pages.send(await crawler.request(query))
+    except StopIteration as finished:
+        return finished.value
+
+PR_BATCH_SIZE = 25  # PRs consultados por requisição (via aliases GraphQL)
+
+PR_DETAILS_FRAGMENT = """
+fragment prDetails on PullRequest {
+  number
+  title
+  state
+  bodyText
+  createdAt
+  closedAt
+  mergedAt
+  comments { totalCount }
+  participants { totalCount }
+  reviews { totalCount }
+  files(first: 100) {
+    totalCount
+    nodes {
+      additions
+      deletions
+    }
+  }
+}
+"""
 
 def fetch_pr_details(owner, repo_name, pr_number):
-    query = f"""
+    details = fetch_pr_details_batch(owner, repo_name, [pr_number])
+    return details[0] if details else None
+
+def pr_details_query(owner, repo_name, pr_numbers):
+    """Consulta com os detalhes de vários PRs, um alias `pullRequest(number:)` por PR."""
+    aliases = "\n".join(
+        f"pr{i}: pullRequest(number: {number}) {{ ...prDetails }}"
+        for i, number in enumerate(pr_numbers)
+    )
+    return f"""
     {{
       repository(owner: "{owner}", name: "{repo_name}") {{
-        pullRequest(number: {pr_number}) {{
-          number
-          title
-          state
-          bodyText
-          createdAt
-          closedAt
-          mergedAt
-          comments {{ totalCount }}
-          participants {{ totalCount }}
-          reviews {{ totalCount }}
-          files(first: 100) {{
-            totalCount
-            nodes {{
-              additions
-              deletions
-            }}
-          }}
-        }}
+        {aliases}
       }}
     }}
+    {PR_DETAILS_FRAGMENT}
     """
-    data = make_github_request(query)
-    if data and "data" in data:
-        return data["data"]["repository"]["pullRequest"]
+
+def parse_pr_details(data, count):
+    """Detalhes dos PRs de um lote, ou None se a consulta do lote falhou."""
+    if data and data.get("data") and data["data"].get("repository"):
+        repository = data["data"]["repository"]
+        return [repository[f"pr{i}"] for i in range(count) if repository.get(f"pr{i}")]
     return None
 
-def calculate_pr_metrics(pr_data):
+def fetch_pr_details_batch(owner, repo_name, pr_numbers):
+    """Busca os detalhes de vários PRs numa única requisição (None se ela falhar)."""
+    return parse_pr_details(make_github_request(pr_details_query(owner, repo_name, pr_numbers)), len(pr_numbers))
+
+def calculate_pr_metrics(pr_data, repo_id=0):
+    """
+    Extrai as métricas de uma PR num `PRRecord` compacto: estado como `PRState` e datas em microssegundos UTC.
+    O tempo de análise é calculado de uma vez para todas as PRs em `build_pr_table`.
+    """
     if not pr_data:
         return None
 
-    created_at = datetime.datetime.strptime(pr_data['createdAt'], '%Y-%m-%dT%H:%M:%SZ')
     end_time = pr_data['mergedAt'] if pr_data['state'] == 'MERGED' else pr_data['closedAt']
     if not end_time:
         return None
 
-    end_time = datetime.datetime.strptime(end_time, '%Y-%m-%dT%H:%M:%SZ')
-    analysis_time = (end_time - created_at).total_seconds() / 3600
-    if analysis_time < 1:
-        return None
-
     total_files = pr_data['files']['totalCount']
     total_additions = sum(file['additions'] for file in pr_data['files']['nodes'])
     total_deletions = sum(file['deletions'] for file in pr_data['files']['nodes'])
@@ -189,226 +299,282 @@ def calculate_pr_metrics(pr_data):
 
     feedback_score = total_comments + total_participants + total_reviews
 
-    return {
-        "pr_number": pr_data['number'],
-        "state": pr_data['state'],
-        "analysis_time_hours": analysis_time,
-        "total_files": total_files,
-        "total_additions": total_additions,
-        "total_deletions": total_deletions,
-        "description_length": description_length,
-        "total_comments": total_comments,
-        "total_participants": total_participants,
-        "total_reviews": total_reviews,
-        "feedback_score": feedback_score   # <-- Agora tem o feedback_score aqui!
-    }
+    return pr_records.PRRecord(
+        repo_id=repo_id,
+        pr_number=pr_data['number'],
+        state=pr_records.PRState[pr_data['state']],
+        created_at=pr_records.to_microseconds(pr_data['createdAt']),
+        closed_at=pr_records.to_microseconds(end_time),
+        total_files=total_files,
+        total_additions=total_additions,
+        total_deletions=total_deletions,
+        description_length=description_length,
+        total_comments=total_comments,
+        total_participants=total_participants,
+        total_reviews=total_reviews,
+        feedback_score=feedback_score,
+    )
+
+
+def build_pr_table(pr_columns):
+    """
+    Converte as PRs coletadas (`PRColumns`) numa tabela Arrow, calculando `analysis_time_hours` para todas
+    de uma vez. PRs analisadas em menos de uma hora são descartadas.
+    """
+    table = pr_columns.to_arrow(REPOSITORIES)
+    return table.filter(pc.greater_equal(table["analysis_time_hours"], 1))
 
 
-def collect_repository_metrics(repository, max_prs=100):
+def append_pr_records(pr_columns, pr_details_list, repo_id):
+    for pr_details in pr_details_list:
+        # Garantir que os dados da PR sejam válidos antes de calcular as métricas
+        if pr_details:
+            record = calculate_pr_metrics(pr_details, repo_id)
+            if record:
+                pr_columns.append(record)
+
+
+def collect_repository_metrics(repository, max_prs=100, batch_size=PR_BATCH_SIZE, reviewed_prs=None):
+    """Coleta os detalhes dos PRs revisados em lotes. Retorna (`PRColumns`, número de consultas que falharam)."""
     repo_name = repository['node']['name']
     owner = repository['node']['owner']['login']
-    all_metrics = []
+    repo_id = REPOSITORIES.repo_id(owner, repo_name)
+    pr_columns = pr_records.PRColumns()
     print(f"\n📊 Coletando métricas para {owner}/{repo_name}...")
 
-    reviewed_prs = fetch_pull_requests(repository)
+    failures = 0
+    # Reaproveita a listagem de PRs quando ela já foi buscada por quem chamou
+    if reviewed_prs is None:
+        reviewed_prs, _, discovery_failed = fetch_pull_requests(repository, max_prs=max_prs)
+        failures += discovery_failed
+    pr_numbers = [pr['number'] for pr in reviewed_prs[:max_prs]]
+
+    # Cada lote de respostas vira registros compactos antes de buscar o próximo
+    for i in range(0, len(pr_numbers), batch_size):
+        details = fetch_pr_details_batch(owner, repo_name, pr_numbers[i:i + batch_size])
+        if details is None:
+            failures += 1
+            continue
+        append_pr_records(pr_columns, details, repo_id)
+
+    return pr_columns, failures
+
+
+def collect_repository(repository, max_prs=100, discovery=PR_DISCOVERY):
+    """
+    Encontra os PRs revisados de um repositório e coleta suas métricas.
+    Retorna (total de PRs revisados, `PRColumns`, número de consultas que falharam).
+    """
+    reviewed_prs, total, discovery_failed = fetch_pull_requests(repository, max_prs=max_prs, discovery=discovery)
+    print(f"📌 {repository['node']['owner']['login']}/{repository['node']['name']} - PRs Revisados: {total}")
+    if not reviewed_prs:
+        return total, pr_records.PRColumns(), int(discovery_failed)
+    pr_columns, failures = collect_repository_metrics(repository, max_prs=max_prs, reviewed_prs=reviewed_prs)
+    return total, pr_columns, failures + discovery_failed
 
-    for pr in reviewed_prs[:max_prs]:
-        pr_details = fetch_pr_details(owner, repo_name, pr['number'])
-        
-        # Garantir que os dados da PR sejam válidos antes de calcular as métricas
-        if pr_details:
-            metrics = calculate_pr_metrics(pr_details)
-            if metrics:
-                metrics.update({
-                    "repo_owner": owner,
-                    "repo_name": repo_name
-                })
-                all_metrics.append(metrics)
 
-    return all_metrics
+async def collect_repository_async(crawler, repository, max_prs=100, batch_size=PR_BATCH_SIZE, discovery=PR_DISCOVERY):
+    """Versão de `collect_repository` para o `AsyncCrawler`: os lotes de detalhes dos PRs são buscados ao mesmo tempo."""
+    repo_name = repository['node']['name']
+    owner = repository['node']['owner']['login']
+    reviewed_prs, total, discovery_failed = await fetch_pull_requests_async(crawler, repository, max_prs=max_prs, discovery=discovery)
+    print(f"📌 {owner}/{repo_name} - PRs Revisados: {total}")
+
+    pr_columns = pr_records.PRColumns()
+    failures = int(discovery_failed)
+    if not reviewed_prs:
+        return total, pr_columns, failures
+    print(f"\n📊 Coletando métricas para {owner}/{repo_name}...")
+
+    repo_id = REPOSITORIES.repo_id(owner, repo_name)
+    pr_numbers = [pr['number'] for pr in reviewed_prs[:max_prs]]
+    batches = [pr_numbers[i:i + batch_size] for i in range(0, len(pr_numbers), batch_size)]
+    responses = await asyncio.gather(*(
+        crawler.request(pr_details_query(owner, repo_name, batch)) for batch in batches
+    ))
+    for batch, data in zip(batches, responses):
+        details = parse_pr_details(data, len(batch))
+        if details is None:
+            failures += 1
+            continue
+        append_pr_records(pr_columns, details, repo_id)
+
+    return total, pr_columns, failures
+
+
+CORRELATION_METRICS = [
+    "analysis_time_hours", "total_files", "total_additions",
+    "total_deletions", "description_length", "total_comments",
+    "total_participants", "total_reviews"
+]
+# Colunas lidas do armazenamento de PRs para a matriz de correlação e os gráficos das RQs
+ANALYSIS_COLUMNS = CORRELATION_METRICS + ["state"]
 
 
 def analyze_correlations(df):
-    metrics = [
-        "analysis_time_hours", "total_files", "total_additions",
-        "total_deletions", "description_length", "total_comments",
-        "total_participants", "total_reviews"
-    ]
-    corr_matrix = pd.DataFrame(index=metrics, columns=metrics)
-    for i in range(len(metrics)):
-        for j in range(len(metrics)):
-            m1, m2 = metrics[i], metrics[j]
-            corr, _ = spearmanr(df[m1], df[m2])
-            corr_matrix.loc[m1, m2] = round(corr, 2)
-    corr_matrix = corr_matrix.astype(float)
-    return corr_matrix
+    """Matriz de Spearman entre as métricas dos PRs, calculada de uma vez (NaN tratados por par)."""
+    return correlation.spearman_matrix(df, CORRELATION_METRICS).round(2)
 
 def exibir_grafico_correlacao(corr_matrix):
-    plt.figure(figsize=(10, 8))
-    sns.heatmap(corr_matrix, annot=True, cmap="coolwarm", vmin=-1, vmax=1)
-    plt.title("Matriz de Correlação (Spearman) entre Métricas dos Pull Requests")
-    plt.tight_layout()
-    plt.show()
+    return chart_renderer.render([
+        chart_renderer.chart("correlacao_spearman", charts.desenhar_correlacao, corr_matrix, (10, 8)),
+    ])
 
 def exibir_grafico_distribuicao(serie, nome_campo, tipo='histograma'):
     """
     Gera gráficos de distribuição para as métricas de cada RQ.
     """
-    plt.figure(figsize=(10, 6))
-    
-    if tipo == 'histograma':
-        sns.histplot(serie, kde=True, bins=20, color='blue')
-        plt.title(f"Distribuição de {nome_campo}")
-        plt.xlabel(nome_campo)
-        plt.ylabel("Frequência")
-    elif tipo == 'boxplot':
-        sns.boxplot(x=serie, color='green')
-        plt.title(f"Boxplot de {nome_campo}")
-        plt.xlabel(nome_campo)
-    
-    plt.tight_layout()
-    plt.show()
+    dados = {"serie": serie, "nome_campo": nome_campo, "tipo": tipo}
+    return chart_renderer.render([
+        chart_renderer.chart(f"distribuicao_{serie.name or nome_campo}_{tipo}", charts.desenhar_distribuicao, dados),
+    ])
+
+# Gráficos das RQs: (nome do arquivo, coluna, título, rótulo do eixo da métrica)
+GRAFICOS_FEEDBACK = [
+    ("rq01_tamanho_estado", "total_additions", "RQ 01: Relação entre o tamanho dos PRs e o feedback final das revisões", "Tamanho dos PRs (Adições)"),
+    ("rq02_tempo_estado", "analysis_time_hours", "RQ 02: Relação entre o tempo de análise dos PRs e o feedback final das revisões", "Tempo de Análise (horas)"),
+    ("rq03_descricao_estado", "description_length", "RQ 03: Relação entre a descrição dos PRs e o feedback final das revisões", "Tamanho da Descrição"),
+    ("rq04_interacoes_estado", "total_comments", "RQ 04: Relação entre as interações nos PRs e o feedback final das revisões", "Número de Comentários"),
+]
+GRAFICOS_REVISOES = [
+    ("rq05_tamanho_revisoes", "total_additions", "RQ 05: Relação entre o tamanho dos PRs e o número de revisões realizadas", "Tamanho dos PRs (Adições)"),
+    ("rq06_tempo_revisoes", "analysis_time_hours", "RQ 06: Relação entre o tempo de análise dos PRs e o número de revisões realizadas", "Tempo de Análise (horas)"),
+    ("rq07_descricao_revisoes", "description_length", "RQ 07: Relação entre a descrição dos PRs e o número de revisões realizadas", "Tamanho da Descrição"),
+    ("rq08_interacoes_revisoes", "total_comments", "RQ 08: Relação entre as interações nos PRs e o número de revisões realizadas", "Número de Comentários"),
+]
 
 def gerar_graficos_metrics(df):
     """
     Gera gráficos para os RQs especificados: Tamanho, Tempo, Descrição, Interações, Revisões.
+    Os oito gráficos são independentes e gerados de uma vez (em paralelo no modo sem interface).
     """
+    graficos = []
 
     # A) Feedback Final das Revisões (Status do PR)
     print("\n📊 Gráficos - Feedback Final das Revisões")
-    
-    # RQ 01: Relação entre o tamanho dos PRs e o feedback final das revisões (PR estado: MERGED ou CLOSED)
-    plt.figure(figsize=(10, 6))
-    sns.boxplot(x='state', y='total_additions', data=df)
-    plt.title("RQ 01: Relação entre o tamanho dos PRs e o feedback final das revisões")
-    plt.xlabel("Status do PR")
-    plt.ylabel("Tamanho dos PRs (Adições)")
-    plt.tight_layout()
-    plt.show()
-
-    # RQ 02: Relação entre o tempo de análise dos PRs e o feedback final das revisões
-    plt.figure(figsize=(10, 6))
-    sns.boxplot(x='state', y='analysis_time_hours', data=df)
-    plt.title("RQ 02: Relação entre o tempo de análise dos PRs e o feedback final das revisões")
-    plt.xlabel("Status do PR")
-    plt.ylabel("Tempo de Análise (horas)")
-    plt.tight_layout()
-    plt.show()
-
-    # RQ 03: Relação entre a descrição dos PRs e o feedback final das revisões
-    plt.figure(figsize=(10, 6))
-    sns.boxplot(x='state', y='description_length', data=df)
-    plt.title("RQ 03: Relação entre a descrição dos PRs e o feedback final das revisões")
-    plt.xlabel("Status do PR")
-    plt.ylabel("Tamanho da Descrição")
-    plt.tight_layout()
-    plt.show()
-
-    # RQ 04: Relação entre as interações nos PRs e o feedback final das revisões
-    plt.figure(figsize=(10, 6))
-    sns.boxplot(x='state', y='total_comments', data=df)
-    plt.title("RQ 04: Relação entre as interações nos PRs e o feedback final das revisões")
-    plt.xlabel("Status do PR")
-    plt.ylabel("Número de Comentários")
-    plt.tight_layout()
-    plt.show()
+    for nome, coluna, titulo, rotulo in GRAFICOS_FEEDBACK:
+        dados = {"df": df[['state', coluna]], "coluna": coluna, "titulo": titulo, "rotulo": rotulo}
+        graficos.append(chart_renderer.chart(nome, charts.desenhar_boxplot_estado, dados))
 
     # B) Número de Revisões
     print("\n📊 Gráficos - Número de Revisões")
+    for nome, coluna, titulo, rotulo in GRAFICOS_REVISOES:
+        dados = {"df": df[[coluna, 'total_reviews']], "coluna": coluna, "titulo": titulo, "rotulo": rotulo}
+        graficos.append(chart_renderer.chart(nome, charts.desenhar_dispersao_revisoes, dados))
+
+    return chart_renderer.render(graficos)
 
-    # RQ 05: Relação entre o tamanho dos PRs e o número de revisões realizadas
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(x='total_additions', y='total_reviews', data=df)
-    plt.title("RQ 05: Relação entre o tamanho dos PRs e o número de revisões realizadas")
-    plt.xlabel("Tamanho dos PRs (Adições)")
-    plt.ylabel("Número de Revisões")
-    plt.tight_layout()
-    plt.show()
-
-    # RQ 06: Relação entre o tempo de análise dos PRs e o número de revisões realizadas
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(x='analysis_time_hours', y='total_reviews', data=df)
-    plt.title("RQ 06: Relação entre o tempo de análise dos PRs e o número de revisões realizadas")
-    plt.xlabel("Tempo de Análise (horas)")
-    plt.ylabel("Número de Revisões")
-    plt.tight_layout()
-    plt.show()
-
-    # RQ 07: Relação entre a descrição dos PRs e o número de revisões realizadas
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(x='description_length', y='total_reviews', data=df)
-    plt.title("RQ 07: Relação entre a descrição dos PRs e o número de revisões realizadas")
-    plt.xlabel("Tamanho da Descrição")
-    plt.ylabel("Número de Revisões")
-    plt.tight_layout()
-    plt.show()
-
-    # RQ 08: Relação entre as interações nos PRs e o número de revisões realizadas
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(x='total_comments', y='total_reviews', data=df)
-    plt.title("RQ 08: Relação entre as interações nos PRs e o número de revisões realizadas")
-    plt.xlabel("Número de Comentários")
-    plt.ylabel("Número de Revisões")
-    plt.tight_layout()
-    plt.show()
- 
-
-def process_data(repositories):
-    repo_list = []
-    all_pr_metrics = []
-    for repo in repositories:
-        repo_name = repo['node']['name']
-        owner = repo['node']['owner']['login']
-        reviewed_prs = fetch_pull_requests(repo)
-        reviewed_pr_count = len(reviewed_prs)
-        print(f"📌 {owner}/{repo_name} - PRs Revisados: {reviewed_pr_count}")
-        pr_metrics = collect_repository_metrics(repo, max_prs=10) if reviewed_pr_count > 0 else []
 
+def summarize_repository(repo, reviewed_pr_count, df_metrics):
+    """Linha do DataFrame de repositórios, com as médias das métricas dos PRs do repositório."""
+    avg_metrics = {
+        "avg_analysis_time": 0, "avg_files": 0, "avg_additions": 0,
+        "avg_deletions": 0, "avg_description": 0, "avg_comments": 0,
+        "avg_participants": 0, "avg_reviews": 0, "merge_rate": 0
+    }
+
+    if not df_metrics.empty:
         avg_metrics = {
-            "avg_analysis_time": 0, "avg_files": 0, "avg_additions": 0,
-            "avg_deletions": 0, "avg_description": 0, "avg_comments": 0,
-            "avg_participants": 0, "avg_reviews": 0, "merge_rate": 0
+            "avg_analysis_time": df_metrics['analysis_time_hours'].mean(),
+            "avg_files": df_metrics['total_files'].mean(),
+            "avg_additions": df_metrics['total_additions'].mean(),
+            "avg_deletions": df_metrics['total_deletions'].mean(),
+            "avg_description": df_metrics['description_length'].mean(),
+            "avg_comments": df_metrics['total_comments'].mean(),
+            "avg_participants": df_metrics['total_participants'].mean(),
+            "avg_reviews": df_metrics['total_reviews'].mean(),
+            "merge_rate": len(df_metrics[df_metrics['state'] == 'MERGED']) / len(df_metrics)
         }
 
-        if pr_metrics:
-            df_metrics = pd.DataFrame(pr_metrics)
-            all_pr_metrics.append(df_metrics)
-            avg_metrics = {
-                "avg_analysis_time": df_metrics['analysis_time_hours'].mean(),
-                "avg_files": df_metrics['total_files'].mean(),
-                "avg_additions": df_metrics['total_additions'].mean(),
-                "avg_deletions": df_metrics['total_deletions'].mean(),
-                "avg_description": df_metrics['description_length'].mean(),
-                "avg_comments": df_metrics['total_comments'].mean(),
-                "avg_participants": df_metrics['total_participants'].mean(),
-                "avg_reviews": df_metrics['total_reviews'].mean(),
-                "merge_rate": len(df_metrics[df_metrics['state'] == 'MERGED']) / len(df_metrics)
-            }
-
-        node = repo['node']
-        repo_data = {
-            "Nome": node['name'],
-            "Proprietário": node['owner']['login'],
-            "Estrelas": node['stargazerCount'],
-            "Linguagem Principal": node['primaryLanguage']['name'] if node['primaryLanguage'] else "Desconhecido",
-            "Total PRs Revisados": reviewed_pr_count,
-            "URL": node['url'],
-            "Tempo Médio Análise (horas)": round(avg_metrics['avg_analysis_time'], 2),
-            "Arquivos Médios por PR": round(avg_metrics['avg_files'], 1),
-            "Linhas Adicionadas Média": round(avg_metrics['avg_additions'], 1),
-            "Linhas Removidas Média": round(avg_metrics['avg_deletions'], 1),
-            "Tamanho Médio Descrição": round(avg_metrics['avg_description'], 1),
-            "Comentários Médios": round(avg_metrics['avg_comments'], 1),
-            "Participantes Médios": round(avg_metrics['avg_participants'], 1),
-            "Revisões Médias": round(avg_metrics['avg_reviews'], 1),
-            "Taxa de Merge": f"{round(avg_metrics['merge_rate'] * 100, 1)}%",
-        }
+    node = repo['node']
+    return {
+        "Nome": node['name'],
+        "Proprietário": node['owner']['login'],
+        "Estrelas": node['stargazerCount'],
+        "Linguagem Principal": node['primaryLanguage']['name'] if node['primaryLanguage'] else "Desconhecido",
+        "Total PRs Revisados": reviewed_pr_count,
+        "URL": node['url'],
+        "Tempo Médio Análise (horas)": round(avg_metrics['avg_analysis_time'], 2),
+        "Arquivos Médios por PR": round(avg_metrics['avg_files'], 1),
+        "Linhas Adicionadas Média": round(avg_metrics['avg_additions'], 1),
+        "Linhas Removidas Média": round(avg_metrics['avg_deletions'], 1),
+        "Tamanho Médio Descrição": round(avg_metrics['avg_description'], 1),
+        "Comentários Médios": round(avg_metrics['avg_comments'], 1),
+        "Participantes Médios": round(avg_metrics['avg_participants'], 1),
+        "Revisões Médias": round(avg_metrics['avg_reviews'], 1),
+        "Taxa de Merge": f"{round(avg_metrics['merge_rate'] * 100, 1)}%",
+    }
+
+
+def process_data(repositories, max_prs=100, checkpoint=None, store=None, max_in_flight=1, discovery=PR_DISCOVERY):
+    """
+    Percorre os repositórios uma única vez, gravando as PRs de cada um em `store` (um `pr_store.PRStore`)
+    à medida que são coletadas, em vez de acumulá-las em memória. Com um checkpoint, repositórios já
+    processados são pulados e cada repositório só é marcado como concluído depois que suas PRs estão em disco
+    (um repositório coletado de novo substitui suas PRs); sem checkpoint, o armazenamento é esvaziado antes da coleta.
+    Repositórios em que alguma consulta falhou (descoberta ou lote de detalhes) não são gravados nem marcados.
+    Com `max_in_flight` > 1 os repositórios são coletados ao mesmo tempo pelo `AsyncCrawler`, com no máximo
+    `max_in_flight` chamadas à API em andamento. `discovery` escolhe como os PRs revisados são encontrados
+    (veja `PR_DISCOVERY`).
+    Retorna o DataFrame de repositórios (com as médias por repositório) e o armazenamento de PRs.
+    """
+    if store is None:
+        store = pr_store.PRStore()
+    if checkpoint is None:
+        store.clear()
+
+    positions = {}
+    pending = []
+    for repo in repositories:
+        repo_key = f"{repo['node']['owner']['login']}/{repo['node']['name']}"
+        positions[repo_key] = len(positions)
+        if checkpoint and checkpoint.is_done(repo_key):
+            print(f"⏭️ {repo_key} já processado (checkpoint)")
+            continue
+        pending.append(repo)
+
+    repo_list = []
+    # Estimativa das chamadas por repositório para a previsão de término: a descoberta e os lotes de detalhes
+    calls_per_repository = 1 + math.ceil(max_prs / PR_BATCH_SIZE)
+    remaining = len(pending)
+
+    def save_repository(repo, collected):
+        nonlocal remaining
+        remaining -= 1
+        client.scheduler.report(pending_calls=remaining * calls_per_repository)
+        reviewed_pr_count, pr_columns, failures = collected
+        if failures:
+            # PRs incompletos não são gravados nem marcados no checkpoint: o repositório é coletado de novo ao retomar
+            print(f"⚠️ {repo['node']['owner']['login']}/{repo['node']['name']}: {failures} consulta(s) falharam; "
+                  "repositório não salvo e será coletado novamente na próxima execução")
+            return
+        pr_table = build_pr_table(pr_columns)
+        repo_data = summarize_repository(repo, reviewed_pr_count, pr_table.to_pandas())
         repo_list.append(repo_data)
 
-    if all_pr_metrics:
-        combined_df = pd.concat(all_pr_metrics, ignore_index=True)
-        corr_matrix = analyze_correlations(combined_df)
+        repo_key = f"{repo_data['Proprietário']}/{repo_data['Nome']}"
+        store.write(repo_key, pr_table)
+        if checkpoint:
+            checkpoint.save_record(repo_key, {"repo": repo_data})
+
+    if max_in_flight > 1:
+        crawler = async_crawler.AsyncCrawler(make_github_request, max_in_flight=max_in_flight)
+        crawler.run(pending, lambda crawler, repo: collect_repository_async(crawler, repo, max_prs, discovery=discovery), save_repository)
+    else:
+        for repo in pending:
+            save_repository(repo, collect_repository(repo, max_prs, discovery))
+
+    if checkpoint:
+        # Inclui os repositórios concluídos em execuções anteriores
+        repo_list = [record["repo"] for record in checkpoint.records()]
+    # A coleta simultânea conclui os repositórios fora de ordem; a tabela segue a ordem da busca
+    repo_list.sort(key=lambda repo_data: positions.get(f"{repo_data['Proprietário']}/{repo_data['Nome']}", len(positions)))
+
+    if store.count_rows():
+        # A análise lê só as colunas de que precisa (o ranking de Spearman e os gráficos usam todas as linhas)
+        df_prs = store.read(columns=ANALYSIS_COLUMNS)
+        corr_matrix = analyze_correlations(df_prs)
         exibir_grafico_correlacao(corr_matrix)
-        gerar_graficos_metrics(combined_df)  # Gerar os gráficos das métricas
+        gerar_graficos_metrics(df_prs)  # Gerar os gráficos das métricas
 
-    return pd.DataFrame(repo_list)
+    return pd.DataFrame(repo_list), store
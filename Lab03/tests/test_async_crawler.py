@@ -0,0 +1,175 @@
+import asyncio
+import importlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared", "tests"))
+import async_crawler
+import chart_renderer
+import checkpoint
+import graphql_stub
+import pr_store
+
+LATENCY = 0.05  # Segundos de cada resposta do servidor falso
+REPOSITORIES = [
+    {"node": {"name": f"r{k}", "owner": {"login": "o"}, "stargazerCount": k,
+              "primaryLanguage": {"name": "Java"}, "url": f"https://github.com/o/r{k}"}}
+    for k in range(6)
+]
+
+
+def reviewed_numbers(k):
+    return [n for n in range(1, 301) if (n + k) % 3]
+
+
+def pr_details(n, k):
+    closed = f"2024-01-0{n % 8 + 2}T0{k}:00:00Z"
+    return {
+        "number": n, "title": "t", "state": "MERGED" if (n + k) % 2 else "CLOSED", "bodyText": "x" * (n % 50),
+        "createdAt": "2024-01-01T00:00:00Z", "closedAt": closed, "mergedAt": closed,
+        "comments": {"totalCount": n % 5}, "participants": {"totalCount": (n + k) % 4},
+        "reviews": {"totalCount": n % 3 + 1},
+        "files": {"totalCount": 2, "nodes": [{"additions": n, "deletions": k}, {"additions": 2, "deletions": n % 7}]},
+    }
+
+
+def repository_name(query):
+    return (re.search(r'name: "([^"]+)"', query) or re.search(r"repo:\w+/(\w+)", query)).group(1)
+
+
+def respond(query):
+    """Responde às consultas de descoberta (busca) e de detalhes dos PRs."""
+    k = int(repository_name(query)[1:])
+    if "search(query" in query:
+        after = re.search(r'after: (null|"[^"]*")', query).group(1)
+        start = 0 if after == "null" else int(json.loads(after))
+        numbers = reviewed_numbers(k)
+        nodes = [{"number": n, "title": "t", "reviews": {"totalCount": 1}} for n in numbers[start:start + 100]]
+        data = {"search": {"issueCount": len(numbers), "nodes": nodes,
+                           "pageInfo": {"hasNextPage": start + 100 < len(numbers), "endCursor": str(start + 100)}}}
+    else:
+        numbers = [int(n) for n in re.findall(r"number: (\d+)\)", query)]
+        data = {"repository": {f"pr{i}": pr_details(n, k) for i, n in enumerate(numbers)}}
+    return {"data": data}
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    """Módulo da coleta, importado com um token de teste: ele cria o cliente da API ao ser importado."""
+    monkeypatch.setenv("GITHUB_TOKEN", "test")
+    monkeypatch.delenv("GITHUB_CACHE", raising=False)
+    monkeypatch.delenv("GITHUB_CACHE_OFFLINE", raising=False)
+    return importlib.import_module("repositories_adapter")
+
+
+@pytest.fixture
+def server(adapter, monkeypatch, tmp_path):
+    with graphql_stub.GraphQLStub(respond, latency=LATENCY) as stub:
+        monkeypatch.setattr(adapter, "client", stub.client())
+        chart_renderer.configure(str(tmp_path / "charts"), "png", 1)
+        yield stub
+        chart_renderer.configure()
+
+
+def crawl(adapter, server, path, max_in_flight):
+    server.reset_counters()
+    df, store = adapter.process_data(
+        REPOSITORIES, max_prs=100, store=pr_store.PRStore(path), max_in_flight=max_in_flight
+    )
+    prs = store.read().astype({"state": str, "repo_owner": str, "repo_name": str})
+    return df, prs.sort_values(["repo_name", "pr_number"]).reset_index(drop=True)
+
+
+def test_concurrent_crawl_matches_serial_and_respects_limit(adapter, server, tmp_path):
+    serial_df, serial_prs = crawl(adapter, server, tmp_path / "serial", max_in_flight=1)
+    serial_calls = server.calls
+    assert server.peak == 1
+
+    df, prs = crawl(adapter, server, tmp_path / "async", max_in_flight=4)
+    assert 1 < server.peak <= 4
+    assert server.calls == serial_calls
+    pd.testing.assert_frame_equal(df, serial_df)
+    pd.testing.assert_frame_equal(prs, serial_prs)
+    assert len(prs) == 6 * 100
+
+
+def test_report_counts_down_pending_calls(adapter, server, tmp_path, monkeypatch):
+    pending = []
+    monkeypatch.setattr(adapter.client.scheduler, "report", lambda pending_calls=0: pending.append(pending_calls))
+
+    crawl(adapter, server, tmp_path / "prs", max_in_flight=2)
+
+    # 1 descoberta + 100 / 25 lotes de detalhes por repositório ainda não concluído
+    assert pending == [k * 5 for k in range(5, -1, -1)]
+
+
+def test_failure_cancels_pending_work(adapter, server, tmp_path, monkeypatch):
+    request = adapter.make_github_request
+
+    def failing_request(query, max_retries=5):
+        if 'name: "r1"' in query:
+            raise ConnectionError("falha simulada")
+        return request(query, max_retries)
+
+    monkeypatch.setattr(adapter, "make_github_request", failing_request)
+    with pytest.raises(ConnectionError, match="falha simulada"):
+        crawl(adapter, server, tmp_path / "async", max_in_flight=2)
+
+    calls = server.calls
+    time.sleep(5 * LATENCY)
+    assert server.calls == calls  # Nenhuma chamada órfã continua depois da falha
+    assert calls < 6 * 5  # Descoberta + 4 lotes de detalhes por repositório numa coleta completa
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("ThreadPoolExecutor")]
+
+
+def test_every_failure_is_reported():
+    async def collect(crawler, item):
+        if item == 0:
+            raise ValueError("falha na coleta")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            raise KeyError("falha ao cancelar")
+
+    crawler = async_crawler.AsyncCrawler(lambda query: None, max_in_flight=2)
+    with pytest.raises(ValueError, match="falha na coleta") as error:
+        crawler.run([1, 0], collect, lambda item, result: None)
+
+    assert any("falha ao cancelar" in note for note in error.value.__notes__)
+    assert isinstance(error.value.__cause__, BaseExceptionGroup)
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 4])
+def test_failed_queries_leave_repository_for_resume(adapter, server, tmp_path, max_in_flight):
+    def failing(query):
+        # Descoberta de r1 e o segundo lote de detalhes de r2 falham (erro 500)
+        if 'repo:o/r1 ' in query or ('name: "r2"' in query and f"number: {reviewed_numbers(2)[25]})" in query):
+            return 500, {}, {"message": "erro simulado"}
+        return respond(query)
+
+    saved = checkpoint.Checkpoint(str(tmp_path / "checkpoint"))
+    store = pr_store.PRStore(tmp_path / "prs")
+    server.respond = failing
+    adapter.process_data(REPOSITORIES, max_prs=100, checkpoint=saved, store=store, max_in_flight=max_in_flight)
+
+    assert not saved.is_done("o/r1") and not saved.is_done("o/r2")
+    assert all(saved.is_done(f"o/r{k}") for k in (0, 3, 4, 5))
+    assert store.count_rows() == 4 * 100
+
+    # Ao retomar, só os repositórios com falha são coletados, agora por completo
+    server.respond = respond
+    server.queries.clear()
+    df, store = adapter.process_data(REPOSITORIES, max_prs=100, checkpoint=saved, store=store, max_in_flight=max_in_flight)
+
+    assert {repository_name(query) for query in server.queries} == {"r1", "r2"}
+    assert store.count_rows() == 6 * 100
+    assert list(df["Nome"]) == [f"r{k}" for k in range(6)]
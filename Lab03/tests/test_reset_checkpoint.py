@@ -0,0 +1,55 @@
+import importlib
+import os
+import sys
+
+import pyarrow as pa
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+import checkpoint
+import main
+import pr_store
+
+
+def saved_collection(tmp_path, monkeypatch):
+    """Checkpoint e armazenamento de PRs com um repositório já coletado, nas pastas temporárias do teste."""
+    checkpoint_path = str(tmp_path / "lab03")
+    store_path = str(tmp_path / "lab03_prs")
+    monkeypatch.setattr(main, "CHECKPOINT_PATH", checkpoint_path)
+    monkeypatch.setattr(main, "PR_STORE_PATH", store_path)
+
+    saved = checkpoint.Checkpoint(checkpoint_path)
+    saved.update_state(batches_done=1)
+    saved.save_record("o/r", {"repo": {"name": "r"}})
+    pr_store.PRStore(store_path).write("o/r", pa.table({"number": [1, 2]}))
+
+    # A coleta não encontra repositórios: main termina logo após tratar o checkpoint. O módulo cria o cliente
+    # da API ao ser importado, então precisa de um token de teste
+    monkeypatch.setenv("GITHUB_TOKEN", "test")
+    monkeypatch.delenv("GITHUB_CACHE", raising=False)
+    monkeypatch.delenv("GITHUB_CACHE_OFFLINE", raising=False)
+    adapter = importlib.import_module("repositories_adapter")
+    monkeypatch.setattr(adapter, "fetch_repositories", lambda checkpoint=None: [])
+    return checkpoint_path, store_path
+
+
+def test_reset_checkpoint_clears_progress_and_stored_prs(tmp_path, monkeypatch):
+    checkpoint_path, store_path = saved_collection(tmp_path, monkeypatch)
+    monkeypatch.setattr(sys, "argv", ["main.py", "--reset-checkpoint"])
+
+    main.main()
+
+    reloaded = checkpoint.Checkpoint(checkpoint_path)
+    assert not reloaded.is_done("o/r")
+    assert reloaded.get_state("batches_done") is None
+    assert pr_store.PRStore(store_path).count_rows() == 0
+
+
+def test_saved_collection_is_kept_without_reset(tmp_path, monkeypatch):
+    checkpoint_path, store_path = saved_collection(tmp_path, monkeypatch)
+    monkeypatch.setattr(sys, "argv", ["main.py"])
+
+    main.main()
+
+    assert checkpoint.Checkpoint(checkpoint_path).is_done("o/r")
+    assert pr_store.PRStore(store_path).count_rows() == 2
@@ -1,11 +1,15 @@
 import json
 import os
+import sys
 import time
 import matplotlib.pyplot as plt
 import pandas as pd
 import requests
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+import github_client
+
 # Configurações
 REST_URL_USERS = "http://localhost:5000/users"
 
@@ -15,12 +19,7 @@ token = os.getenv("GITHUB_TOKEN")
 if not token:
     raise ValueError("Erro: O token do GitHub não foi encontrado. Verifique o arquivo .env.")
 
-headers = {
-    "Authorization": f"Bearer {token}",
-    "Content-Type": "application/json"
-}
-
-GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+client = github_client.GitHubClient(token)
 
 
 def fetchRepositories():
@@ -62,7 +61,7 @@ def fetchRepositories():
         """
 
         for attempt in range(3):
-            response = requests.post(GITHUB_GRAPHQL_URL, json={"query": query}, headers=headers, )
+            response = client.post(query)
 
             if response.status_code == 200:
                 data = response.json()
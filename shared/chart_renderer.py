@@ -0,0 +1,167 @@
+import hashlib
+import inspect
+import json
+import marshal
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from matplotlib.figure import Figure
+
+# Sem pasta de saída os gráficos abrem em janelas (plt.show); com pasta, são gravados sem interface gráfica
+OUTPUT_DIR = None
+FORMAT = "png"
+WORKERS = os.cpu_count() or 1
+RASTERIZE_POINTS = 5000  # Camadas de dispersão com mais pontos que isso viram imagem dentro do SVG
+CACHE_INDEX = ".chart_cache.json"
+
+_pool = None
+_figures = {}  # Figuras reaproveitadas por tamanho dentro de cada processo
+
+
+def configure(output_dir=None, fmt="png", workers=None):
+    """Define onde e como os gráficos são gerados. `output_dir=None` mantém o modo interativo."""
+    global OUTPUT_DIR, FORMAT, WORKERS
+    close()
+    OUTPUT_DIR = output_dir
+    FORMAT = fmt
+    WORKERS = workers or os.cpu_count() or 1
+
+
+def chart(name, draw, data, figsize=(10, 6)):
+    """
+    Descreve um gráfico: `draw(fig, data)` desenha `data` na figura recebida. `draw` precisa ser uma
+    função de módulo (sem efeitos colaterais ao importar) para poder ser executada em outro processo.
+    """
+    return {"name": name, "draw": draw, "data": data, "figsize": figsize}
+
+
+def render(charts, output_dir=None, fmt=None, cache=False):
+    """
+    Gera os gráficos. No modo interativo cada um abre numa janela, como antes; no modo sem interface
+    cada gráfico vira um arquivo em `output_dir` (OUTPUT_DIR por padrão), distribuindo gráficos
+    independentes entre processos. Com `cache=True`, gráficos cujos dados não mudaram desde a última
+    geração (mesmo hash) não são desenhados de novo. Retorna os caminhos dos arquivos.
+    """
+    if not charts:
+        return []
+
+    output_dir = output_dir or OUTPUT_DIR
+    fmt = fmt or FORMAT
+    if output_dir is None:
+        import matplotlib.pyplot as plt
+
+        for item in charts:
+            fig = plt.figure(figsize=item["figsize"])
+            item["draw"](fig, item["data"])
+            fig.tight_layout()
+            plt.show()
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [chart_path(output_dir, item, fmt) for item in charts]
+
+    pending = charts
+    if cache:
+        index = _load_index(output_dir)
+        hashes = {chart_path(output_dir, item, fmt): chart_hash(item, fmt) for item in charts}
+        pending = []
+        for item, path in zip(charts, paths):
+            if index.get(os.path.basename(path)) == hashes[path] and os.path.exists(path):
+                print(f"♻️ Gráfico {path} sem alterações (cache)")
+            else:
+                pending.append(item)
+
+    if WORKERS <= 1 or len(pending) <= 1:
+        rendered = [render_chart(item, output_dir, fmt) for item in pending]
+    else:
+        rendered = list(_get_pool().map(render_chart, pending, repeat(output_dir), repeat(fmt)))
+
+    for path in rendered:
+        print(f"🖼️ Gráfico salvo em {path}")
+    if cache and rendered:
+        index.update({os.path.basename(path): hashes[path] for path in rendered})
+        _save_index(output_dir, index)
+    return paths
+
+
+def chart_path(output_dir, item, fmt):
+    return os.path.join(output_dir, f"{item['name']}.{fmt}")
+
+
+def chart_hash(item, fmt):
+    """
+    Hash do que determina o arquivo gerado: função de desenho (nome e código), dados, tamanho e formato.
+    Alterar o corpo de `draw` invalida o cache; mudanças apenas em funções auxiliares chamadas por ela não.
+    """
+    draw = item["draw"]
+    content = pickle.dumps((draw.__module__, draw.__qualname__, _draw_code(draw), item["data"], item["figsize"], fmt, RASTERIZE_POINTS))
+    return hashlib.sha256(content).hexdigest()
+
+
+def _draw_code(draw):
+    # O código-fonte cobre também títulos e rótulos; sem ele (ex.: .pyc apenas) usa o bytecode com as constantes
+    try:
+        return inspect.getsource(draw)
+    except (OSError, TypeError):
+        return marshal.dumps(draw.__code__)
+
+
+def render_chart(item, output_dir, fmt):
+    """
+    Desenha um gráfico numa figura Agg reaproveitada e grava o arquivo uma única vez.
+    Executado nos processos do pool.
+    """
+    fig = _figures.get(item["figsize"])
+    if fig is None:
+        fig = _figures[item["figsize"]] = Figure(figsize=item["figsize"])
+    fig.clear()
+
+    item["draw"](fig, item["data"])
+    _rasterize_large_layers(fig)
+    fig.tight_layout()
+
+    path = chart_path(output_dir, item, fmt)
+    fig.savefig(path, format=fmt)
+    return path
+
+
+def _rasterize_large_layers(fig):
+    # Em SVG cada ponto vira um elemento; acima do limite a camada é gravada como imagem, o resto continua vetorial
+    for ax in fig.axes:
+        for collection in ax.collections:
+            if len(collection.get_offsets()) > RASTERIZE_POINTS:
+                collection.set_rasterized(True)
+
+
+def _load_index(output_dir):
+    path = os.path.join(output_dir, CACHE_INDEX)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _save_index(output_dir, index):
+    path = os.path.join(output_dir, CACHE_INDEX)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(index, file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # spawn: os processos não herdam threads nem conexões abertas pela coleta
+        _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def close():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
@@ -0,0 +1,81 @@
+import json
+import os
+
+
+def _to_json(value):
+    # Converte escalares do NumPy/pandas (int64, Timestamp...) para tipos serializáveis
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class Checkpoint:
+    """
+    Guarda o progresso de uma coleta longa em disco para que ela possa ser retomada após uma interrupção.
+    Cada repositório concluído vira uma linha em `<path>.jsonl`; o estado da busca (cursor e repositórios
+    já listados) fica em `<path>.state.json`.
+    """
+
+    def __init__(self, path):
+        self.records_path = f"{path}.jsonl"
+        self.state_path = f"{path}.state.json"
+        os.makedirs(os.path.dirname(os.path.abspath(self.records_path)), exist_ok=True)
+
+        self._records = {}
+        if os.path.exists(self.records_path):
+            with open(self.records_path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Última linha pode ter ficado incompleta se o processo morreu durante a escrita
+                        continue
+                    self._records[entry["key"]] = entry["record"]
+
+        self._state = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as file:
+                self._state = json.load(file)
+
+        if self._records or self._state:
+            print(f"♻️ Retomando a partir do checkpoint {path} ({len(self._records)} repositórios concluídos)")
+
+    def is_done(self, key):
+        return key in self._records
+
+    def get_record(self, key):
+        return self._records.get(key)
+
+    def records(self):
+        """Registros salvos, na ordem em que foram concluídos (repositórios ignorados ficam de fora)."""
+        return [record for record in self._records.values() if record is not None]
+
+    def save_record(self, key, record):
+        """Grava o resultado de um repositório imediatamente. `record=None` marca o repositório como ignorado."""
+        self._records[key] = record
+        with open(self.records_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps({"key": key, "record": record}, ensure_ascii=False, default=_to_json) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def get_state(self, name, default=None):
+        return self._state.get(name, default)
+
+    def update_state(self, **values):
+        """Atualiza o estado da busca gravando num arquivo temporário e substituindo o anterior."""
+        self._state.update(values)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self._state, file, ensure_ascii=False, default=_to_json)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    def clear(self):
+        self._records = {}
+        self._state = {}
+        for path in (self.records_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,97 @@
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import rate_limiter
+import response_cache
+
+try:
+    # HTTP/2 só é usado quando httpx e h2 estão instalados (pip install "httpx[http2]")
+    import h2  # noqa: F401
+    import httpx
+except ImportError:
+    httpx = None
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+POOL_SIZE = 16  # Conexões mantidas abertas por host
+RATE_LIMIT_RETRIES = 5  # Tentativas após respostas recusadas por limite de taxa
+
+
+class GitHubClient:
+    """Cliente GraphQL do GitHub compartilhado pelos laboratórios, com conexões persistentes."""
+
+    def __init__(self, token, url=GITHUB_GRAPHQL_URL, pool_size=POOL_SIZE, scheduler=None, cache=False):
+        self.url = url
+        self.scheduler = scheduler or rate_limiter.RateLimitScheduler()
+        # cache=False usa a configuração das variáveis de ambiente; None desativa o cache
+        self.cache = response_cache.from_environment() if cache is False else cache
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+        }
+
+        if httpx is not None:
+            self.http2 = True
+            self.session = httpx.Client(
+                http2=True,
+                headers=self.headers,
+                timeout=60,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            )
+        else:
+            self.http2 = False
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+    def post(self, query, variables=None):
+        """Envia uma consulta GraphQL respeitando o orçamento da API e retorna a resposta HTTP (ou a do cache)."""
+        key = None
+        if self.cache is not None:
+            key = response_cache.cache_key(query, variables)
+            content = self.cache.get(key)
+            if content is not None:
+                return response_cache.CachedResponse(content)
+            if self.cache.offline:
+                return response_cache.CachedResponse(b'{"message": "consulta fora do cache (modo offline)"}', status_code=504)
+
+        original_query = query
+        query = rate_limiter.with_rate_limit_field(query)
+        payload = {"query": query}
+        if variables:
+            payload["variables"] = variables
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            cost = self.scheduler.acquire(query)
+            response = None
+            started = time.perf_counter()
+            try:
+                response = self._send(payload)
+            finally:
+                self.scheduler.release(query, cost, response, time.perf_counter() - started)
+
+            if not self.scheduler.is_rate_limited(response) or attempt == RATE_LIMIT_RETRIES:
+                if key is not None and response.status_code == 200:
+                    self.cache.put(key, original_query, response.content)
+                return response
+            print(f"⚠️ Limite de taxa atingido ({response.status_code}). Tentativa {attempt + 1}/{RATE_LIMIT_RETRIES}...")
+
+    def _send(self, payload):
+        if self.http2:
+            return self.session.post(self.url, json=payload)
+        return self.session.post(self.url, json=payload, timeout=60)
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,236 @@
+import math
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+HOURLY_POINTS = 5000  # Orçamento padrão de pontos GraphQL por hora
+POINTS_PER_MINUTE = 2000  # Limite secundário de pontos GraphQL por minuto
+MAX_CONCURRENT = 50  # Limite secundário de requisições simultâneas
+RESERVE_POINTS = 10  # Margem deixada no orçamento antes de aguardar o reset
+
+RATE_LIMIT_FIELD = "rateLimit { limit cost remaining resetAt }"
+
+_TOKENS = re.compile(r'\{|\}|\((?:[^()"]|"(?:[^"\\]|\\.)*")*\)')
+_PAGE_SIZE = re.compile(r'\b(?:first|last)\s*:\s*(\d+)')
+_LITERALS = re.compile(r'"(?:[^"\\]|\\.)*"|\b\d+\b')
+
+
+def estimate_query_cost(query):
+    """Estima o custo em pontos de uma consulta pela fórmula do GitHub (nós solicitados / 100, mínimo 1)."""
+    requests_count = 0
+    multipliers = [1]
+    pending_page = None
+
+    for token in _TOKENS.findall(query):
+        if token == "{":
+            if pending_page is not None:
+                requests_count += math.prod(multipliers)
+                multipliers.append(pending_page)
+            else:
+                multipliers.append(1)
+            pending_page = None
+        elif token == "}":
+            if len(multipliers) > 1:
+                multipliers.pop()
+            pending_page = None
+        else:
+            match = _PAGE_SIZE.search(token)
+            pending_page = int(match.group(1)) if match else None
+
+    return max(1, round(requests_count / 100))
+
+
+def with_rate_limit_field(query):
+    """Inclui o campo `rateLimit` numa consulta anônima para que a resposta informe custo e orçamento."""
+    stripped = query.strip()
+    if "rateLimit" in stripped or not stripped.startswith("{"):
+        return query
+    return "{ " + RATE_LIMIT_FIELD + " " + stripped[1:]
+
+
+def query_shape(query):
+    """Remove cursores, nomes e números da consulta para agrupar consultas de mesmo formato."""
+    return " ".join(_LITERALS.sub("?", query).split())
+
+
+def _parse_reset(value):
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) or str(value).isdigit():
+        return float(value)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+class RateLimitScheduler:
+    """Controla o orçamento de pontos da API GraphQL e espaça as chamadas apenas quando necessário."""
+
+    def __init__(self, hourly_points=HOURLY_POINTS, points_per_minute=POINTS_PER_MINUTE,
+                 max_concurrent=MAX_CONCURRENT, reserve=RESERVE_POINTS, clock=time.time, sleep=time.sleep):
+        self.limit = hourly_points
+        self.remaining = hourly_points
+        self.reset_at = None
+        self.points_per_minute = points_per_minute
+        self.reserve = reserve
+        self.clock = clock
+        self.sleep = sleep
+
+        self.calls = 0
+        self.points_spent = 0
+        self.total_call_seconds = 0.0
+        self.blocked_until = 0.0
+
+        self._learned_costs = {}
+        self._recent_points = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def predict_cost(self, query):
+        """Usa o custo observado para consultas do mesmo formato ou, na falta dele, a estimativa estática."""
+        return self._learned_costs.get(query_shape(query)) or estimate_query_cost(query)
+
+    def acquire(self, query):
+        """Bloqueia até haver orçamento para a consulta e reserva uma vaga de execução. Retorna o custo previsto."""
+        cost = self.predict_cost(query)
+        while True:
+            with self._lock:
+                wait = self._wait_time(cost)
+                if wait <= 0:
+                    self.remaining -= cost
+                    self._recent_points.append((self.clock(), cost))
+                    break
+            print(f"⏳ Limite da API: aguardando {wait:.1f}s (restantes: {self.remaining}/{self.limit} pontos)")
+            self.sleep(wait)
+        self._slots.acquire()
+        return cost
+
+    def release(self, query, predicted_cost, response=None, elapsed=0.0):
+        """Libera a vaga e atualiza o orçamento com os cabeçalhos `X-RateLimit-*` e o campo `rateLimit` da resposta."""
+        self._slots.release()
+        with self._lock:
+            self.calls += 1
+            self.total_call_seconds += elapsed
+            if response is None:
+                self.remaining += predicted_cost
+                return
+
+            actual_cost = predicted_cost
+            response_headers = getattr(response, "headers", {}) or {}
+
+            if "X-RateLimit-Remaining" in response_headers:
+                self.remaining = int(response_headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Limit" in response_headers:
+                self.limit = int(response_headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Reset" in response_headers:
+                self.reset_at = _parse_reset(response_headers["X-RateLimit-Reset"])
+
+            rate_limit = self._body_rate_limit(response)
+            if rate_limit:
+                actual_cost = rate_limit.get("cost", actual_cost)
+                self.remaining = rate_limit.get("remaining", self.remaining)
+                self.limit = rate_limit.get("limit", self.limit)
+                self.reset_at = _parse_reset(rate_limit.get("resetAt")) or self.reset_at
+                self._learned_costs[query_shape(query)] = actual_cost
+
+            self.points_spent += actual_cost
+
+            if response.status_code in (403, 429):
+                retry_after = response_headers.get("Retry-After")
+                if retry_after is not None:
+                    self.blocked_until = max(self.blocked_until, self.clock() + float(retry_after))
+                elif self.remaining <= 0 and self.reset_at:
+                    self.blocked_until = max(self.blocked_until, self.reset_at)
+                else:
+                    # Limite secundário sem Retry-After: o GitHub recomenda esperar ao menos um minuto
+                    self.blocked_until = max(self.blocked_until, self.clock() + 60)
+
+    def is_rate_limited(self, response):
+        """Indica se a resposta foi recusada por limite primário ou secundário e deve ser repetida."""
+        if response.status_code not in (403, 429):
+            return False
+        response_headers = getattr(response, "headers", {}) or {}
+        return (
+            response.status_code == 429
+            or "Retry-After" in response_headers
+            or response_headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in (getattr(response, "text", "") or "").lower()
+        )
+
+    def metrics(self, pending_calls=0):
+        """Retorna o orçamento restante e a previsão de término para `pending_calls` chamadas ainda por fazer."""
+        with self._lock:
+            now = self.clock()
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_at": datetime.fromtimestamp(self.reset_at, timezone.utc) if self.reset_at else None,
+                "calls": self.calls,
+                "points_spent": self.points_spent,
+                "avg_call_seconds": self.total_call_seconds / self.calls if self.calls else 0.0,
+                "projected_finish": datetime.fromtimestamp(now + self._projected_seconds(pending_calls), timezone.utc),
+            }
+
+    def report(self, pending_calls=0):
+        """Mostra o orçamento e, quando há `pending_calls` chamadas ainda por fazer, a previsão de término."""
+        metrics = self.metrics(pending_calls)
+        reset = metrics["reset_at"].strftime("%H:%M:%S") if metrics["reset_at"] else "?"
+        projection = (
+            f" | {pending_calls} chamadas restantes, término previsto: {metrics['projected_finish'].strftime('%H:%M:%S')} UTC"
+            if pending_calls else ""
+        )
+        print(
+            f"📉 Orçamento da API: {metrics['remaining']}/{metrics['limit']} pontos (reinicia às {reset} UTC) | "
+            f"{metrics['calls']} chamadas, {metrics['points_spent']} pontos gastos{projection}"
+        )
+
+    def _wait_time(self, cost):
+        now = self.clock()
+        if self.blocked_until > now:
+            return self.blocked_until - now
+
+        if self.reset_at and now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = None
+
+        if self.remaining - cost < self.reserve:
+            if self.reset_at is None:
+                # Sem horário de reset conhecido: espera um minuto e volta com o orçamento cheio;
+                # a resposta da próxima chamada corrige `remaining` (ou bloqueia de novo, se recusada)
+                self.reset_at = now + 60
+            return self.reset_at - now
+
+        while self._recent_points and now - self._recent_points[0][0] >= 60:
+            self._recent_points.popleft()
+        points_last_minute = sum(points for _, points in self._recent_points)
+        if self._recent_points and points_last_minute + cost > self.points_per_minute:
+            return 60 - (now - self._recent_points[0][0])
+
+        return 0.0
+
+    def _projected_seconds(self, pending_calls):
+        if not pending_calls:
+            return 0.0
+        avg_cost = self.points_spent / self.calls if self.calls else 1
+        avg_seconds = self.total_call_seconds / self.calls if self.calls else 0.0
+        busy_seconds = pending_calls * avg_seconds
+
+        pending_points = pending_calls * avg_cost
+        if pending_points <= self.remaining - self.reserve:
+            return busy_seconds
+
+        # Pontos além do orçamento atual só ficam disponíveis nas próximas janelas de uma hora
+        now = self.clock()
+        until_reset = (self.reset_at - now) if self.reset_at else 3600
+        extra_windows = math.floor((pending_points - self.remaining) / max(self.limit, 1))
+        return max(busy_seconds, until_reset + extra_windows * 3600)
+
+    @staticmethod
+    def _body_rate_limit(response):
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        if isinstance(body, dict) and isinstance(body.get("data"), dict):
+            return body["data"].get("rateLimit")
+        return None
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "graphql_cache.sqlite")
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # Tamanho máximo das respostas armazenadas (LRU acima disso)
+ACCESS_FLUSH_SIZE = 256  # Acertos acumulados antes de gravar `last_access` no banco
+
+# Tempo de validade (segundos) por tipo de consulta; None significa que a resposta nunca expira
+ENTITY_TTLS = {
+    "closed_pull_request": None,
+    "pull_request": 60 * 60,
+    "pull_request_list": 6 * 60 * 60,
+    "search": 24 * 60 * 60,
+    "default": 6 * 60 * 60,
+}
+
+CLOSED_PR_STATES = {"MERGED", "CLOSED"}
+
+
+def normalize_query(query):
+    """Compacta os espaços da consulta para que variações de formatação gerem a mesma chave."""
+    return " ".join(query.split())
+
+
+def cache_key(query, variables=None):
+    content = normalize_query(query) + "\n" + json.dumps(variables or {}, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def entity_type(query, body):
+    """Classifica a resposta para escolher o TTL. PRs fechados ou mesclados não mudam mais."""
+    if "pullRequest(number" in query:
+        states = list(_pull_request_states(body))
+        if states and all(state in CLOSED_PR_STATES for state in states):
+            return "closed_pull_request"
+        return "pull_request"
+    if "pullRequests(" in query:
+        return "pull_request_list"
+    if "search(" in query:
+        return "search"
+    return "default"
+
+
+def _pull_request_states(value):
+    if isinstance(value, dict):
+        if "state" in value and "number" in value:
+            yield value["state"]
+        for child in value.values():
+            yield from _pull_request_states(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _pull_request_states(child)
+
+
+class CachedResponse:
+    """Resposta lida do cache com a mesma interface usada pelos adapters (`status_code`, `text`, `json()`)."""
+
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """Cache local de respostas GraphQL em SQLite, endereçado pelo conteúdo da consulta e das variáveis."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=MAX_CACHE_BYTES, ttls=None, offline=False):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.ttls = {**ENTITY_TTLS, **(ttls or {})}
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._pending_access = {}
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                entity TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._db.commit()
+
+    def get(self, key):
+        """
+        Retorna o corpo da resposta em cache ou None. No modo offline respostas expiradas também valem.
+        O `last_access` dos acertos fica em memória e é gravado em lote (a cada ACCESS_FLUSH_SIZE acertos,
+        antes de gravar uma resposta nova e ao fechar), sem uma transação por leitura.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (not self.offline and row[1] is not None and row[1] < now):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._pending_access[key] = now
+            if len(self._pending_access) >= ACCESS_FLUSH_SIZE:
+                self._flush_access()
+                self._db.commit()
+        return zlib.decompress(row[0])
+
+    def put(self, key, query, content):
+        """Guarda uma resposta bem-sucedida. Respostas com `errors` não são armazenadas."""
+        try:
+            body = json.loads(content)
+        except ValueError:
+            return
+        if not isinstance(body, dict) or body.get("errors") or not body.get("data"):
+            return
+
+        entity = entity_type(query, body)
+        ttl = self.ttls.get(entity, self.ttls["default"])
+        now = time.time()
+        compressed = zlib.compress(content)
+
+        with self._lock:
+            self._flush_access()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, entity, compressed, len(compressed), now, now + ttl if ttl is not None else None, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def size(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._flush_access()
+            self._db.commit()
+            self._db.close()
+        if self.hits:
+            print(f"🗄️ Cache da API: {self.hits} respostas lidas do cache, {self.misses} buscadas na API ({self.path})")
+
+    def _flush_access(self):
+        if self._pending_access:
+            self._db.executemany("UPDATE responses SET last_access = ? WHERE key = ?",
+                                 [(accessed, key) for key, accessed in self._pending_access.items()])
+            self._pending_access.clear()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Remove primeiro as respostas acessadas há mais tempo até voltar ao limite
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+def from_environment():
+    """
+    Cria o cache conforme as variáveis de ambiente. O cache é opcional: GITHUB_CACHE=1 ativa e
+    GITHUB_CACHE_OFFLINE=1 ativa lendo apenas do cache; sem elas as consultas sempre vão à API.
+    """
+    offline = os.getenv("GITHUB_CACHE_OFFLINE", "0") == "1"
+    if os.getenv("GITHUB_CACHE", "0") != "1" and not offline:
+        return None
+    cache = ResponseCache(
+        path=os.getenv("GITHUB_CACHE_PATH", DEFAULT_CACHE_PATH),
+        max_bytes=int(os.getenv("GITHUB_CACHE_MAX_BYTES", MAX_CACHE_BYTES)),
+        offline=offline,
+    )
+    print(f"🗄️ Cache da API ativo{' (modo offline)' if offline else ''}: respostas salvas podem ser reutilizadas ({cache.path})")
+    return cache
@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import github_client
+
+
+class GraphQLStub:
+    """
+    Servidor GraphQL local para os testes dos laboratórios. `respond(query)` recebe cada consulta e devolve
+    `(status, headers, payload)` ou apenas o `payload` (status 200). Registra as consultas recebidas, o total de
+    chamadas e o pico de chamadas simultâneas; `latency` atrasa cada resposta. Use como gerenciador de contexto.
+    """
+
+    def __init__(self, respond, latency=0.0):
+        self.respond = respond
+        self.latency = latency
+        self.queries = []
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self._clients = []
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/graphql"
+
+    def client(self, scheduler=None):
+        """Cliente da API apontado para este servidor, sem cache; é fechado junto com o servidor."""
+        client = github_client.GitHubClient("test", url=self.url, scheduler=scheduler, cache=None)
+        self._clients.append(client)
+        return client
+
+    def reset_counters(self):
+        with self.lock:
+            self.calls = self.peak = 0
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        for client in self._clients:
+            client.close()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _handle(self, query):
+        with self.lock:
+            self.queries.append(query)
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            result = self.respond(query)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        return result if isinstance(result, tuple) else (200, {}, result)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["query"]
+        status, headers, payload = self.server.stub._handle(query)
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
@@ -0,0 +1,49 @@
+import importlib
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import chart_renderer
+
+DRAW_SOURCE = '''
+def draw(fig, data):
+    ax = fig.add_subplot()
+    ax.plot(data)
+    ax.set_title({title!r})
+'''
+
+
+def load_draw(tmp_path, title):
+    """Grava um módulo com a função de desenho e o (re)importa, como após editar o código do gráfico."""
+    (tmp_path / "drawing.py").write_text(DRAW_SOURCE.format(title=title))
+    sys.modules.pop("drawing", None)
+    importlib.invalidate_caches()
+    return importlib.import_module("drawing").draw
+
+
+def test_chart_hash_changes_when_draw_body_changes(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # Cada hash é calculado logo após o carregamento, como em cada execução do laboratório
+    first, same, edited = (
+        chart_renderer.chart_hash(chart_renderer.chart("grafico", load_draw(tmp_path, title), [1, 2, 3]), "png")
+        for title in ("Antes", "Antes", "Depois")
+    )
+
+    assert first == same
+    assert first != edited
+
+
+def test_cached_render_redraws_after_draw_edit(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(chart_renderer, "WORKERS", 1)
+    output_dir = str(tmp_path / "graficos")
+    drawn = []
+    monkeypatch.setattr(chart_renderer, "render_chart", lambda item, out, fmt: drawn.append(item) or chart_renderer.chart_path(out, item, fmt))
+    (tmp_path / "graficos").mkdir()
+    (tmp_path / "graficos" / "grafico.png").write_bytes(b"")
+
+    chart_renderer.render([chart_renderer.chart("grafico", load_draw(tmp_path, "Antes"), [1])], output_dir, "png", cache=True)
+    chart_renderer.render([chart_renderer.chart("grafico", load_draw(tmp_path, "Antes"), [1])], output_dir, "png", cache=True)
+    chart_renderer.render([chart_renderer.chart("grafico", load_draw(tmp_path, "Depois"), [1])], output_dir, "png", cache=True)
+
+    assert len(drawn) == 2
@@ -0,0 +1,112 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import graphql_stub
+import rate_limiter
+
+RESET_EPOCH = 2_000_000_000
+
+
+class FakeClock:
+    """Relógio controlado pelo teste: `sleep` só avança o tempo."""
+
+    def __init__(self, now=RESET_EPOCH - 3600):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if len(self.sleeps) > 10:
+            raise AssertionError("o agendador não sai da espera")
+        self.now += seconds
+
+
+@pytest.fixture
+def server():
+    """Servidor GraphQL local que devolve as respostas roteirizadas em `server.responses`, em ordem."""
+    responses = []
+    with graphql_stub.GraphQLStub(lambda query: responses.pop(0)) as stub:
+        stub.responses = responses
+        yield stub
+
+
+def make_client(server, clock):
+    return server.client(scheduler=rate_limiter.RateLimitScheduler(clock=clock, sleep=clock.sleep))
+
+
+def test_headers_update_budget(server):
+    clock = FakeClock()
+    server.responses.append((200, {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "42",
+        "X-RateLimit-Reset": str(RESET_EPOCH),
+    }, {"data": {"viewer": {"login": "x"}}}))
+
+    with make_client(server, clock) as client:
+        response = client.post("{ viewer { login } }")
+
+    assert response.status_code == 200
+    assert client.scheduler.remaining == 42
+    assert client.scheduler.limit == 5000
+    assert client.scheduler.reset_at == RESET_EPOCH
+
+
+def test_rate_limit_field_updates_budget_and_learns_cost(server):
+    clock = FakeClock()
+    rate_limit = {"limit": 5000, "cost": 7, "remaining": 100, "resetAt": "2033-05-18T03:33:20Z"}
+    server.responses.append((200, {}, {"data": {"rateLimit": rate_limit, "viewer": {"login": "x"}}}))
+
+    with make_client(server, clock) as client:
+        client.post("{ viewer { login } }")
+
+    assert "rateLimit" in server.queries[0]
+    assert client.scheduler.remaining == 100
+    assert client.scheduler.points_spent == 7
+    assert client.scheduler.reset_at == RESET_EPOCH
+    assert client.scheduler.predict_cost(rate_limiter.with_rate_limit_field("{ viewer { login } }")) == 7
+
+
+def test_retry_after_blocks_and_retries(server):
+    clock = FakeClock()
+    server.responses.append((403, {"Retry-After": "30"}, {"message": "You have exceeded a secondary rate limit"}))
+    server.responses.append((200, {}, {"data": {"viewer": {"login": "x"}}}))
+
+    with make_client(server, clock) as client:
+        response = client.post("{ viewer { login } }")
+
+    assert response.status_code == 200
+    assert len(server.queries) == 2
+    assert sum(clock.sleeps) == pytest.approx(30)
+
+
+def test_exhausted_budget_without_reset_time_waits_once():
+    clock = FakeClock()
+    scheduler = rate_limiter.RateLimitScheduler(clock=clock, sleep=clock.sleep)
+    scheduler.remaining = 0
+
+    scheduler.acquire("{ viewer { login } }")
+
+    assert clock.sleeps == [60]
+    assert scheduler.remaining == scheduler.limit - 1
+
+
+def test_report_projects_finish_from_pending_calls(capsys):
+    clock = FakeClock()
+    scheduler = rate_limiter.RateLimitScheduler(clock=clock, sleep=clock.sleep)
+    for _ in range(4):
+        cost = scheduler.acquire("{ viewer { login } }")
+        scheduler.release("{ viewer { login } }", cost, elapsed=2.0)
+
+    # 30 chamadas de 2s ainda por fazer: término previsto 60s depois de agora
+    assert (scheduler.metrics(pending_calls=30)["projected_finish"].timestamp() - clock()) == pytest.approx(60)
+    scheduler.report(pending_calls=30)
+    assert "30 chamadas restantes, término previsto" in capsys.readouterr().out
+
+    scheduler.report()
+    assert "término previsto" not in capsys.readouterr().out
@@ -0,0 +1,57 @@
+import json
+import os
+import sqlite3
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import response_cache
+
+QUERY = "{ viewer { login } }"
+CONTENT = json.dumps({"data": {"viewer": {"login": "x"}}}).encode()
+
+
+def last_access(path, key):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT last_access FROM responses WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setenv("GITHUB_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    monkeypatch.delenv("GITHUB_CACHE", raising=False)
+    monkeypatch.delenv("GITHUB_CACHE_OFFLINE", raising=False)
+    assert response_cache.from_environment() is None
+
+    monkeypatch.setenv("GITHUB_CACHE", "1")
+    cache = response_cache.from_environment()
+    assert cache is not None and not cache.offline
+    cache.close()
+
+    monkeypatch.delenv("GITHUB_CACHE")
+    monkeypatch.setenv("GITHUB_CACHE_OFFLINE", "1")
+    cache = response_cache.from_environment()
+    assert cache is not None and cache.offline
+    cache.close()
+
+
+def test_hits_update_last_access_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "ACCESS_FLUSH_SIZE", 3)
+    path = str(tmp_path / "cache.sqlite")
+    cache = response_cache.ResponseCache(path=path)
+    keys = [response_cache.cache_key(QUERY, {"n": n}) for n in range(3)]
+    for key in keys:
+        cache.put(key, QUERY, CONTENT)
+    stored = {key: last_access(path, key) for key in keys}
+
+    assert cache.get(keys[0]) == CONTENT
+    assert cache.get(keys[1]) == CONTENT
+    # Os acertos ainda não foram gravados
+    assert all(last_access(path, key) == stored[key] for key in keys)
+
+    assert cache.get(keys[2]) == CONTENT
+    assert all(last_access(path, key) > stored[key] for key in keys)
+
+    cache.get(keys[0])
+    before_close = last_access(path, keys[0])
+    cache.close()
+    assert last_access(path, keys[0]) > before_close
+    assert cache.hits == 4